@@ -0,0 +1,3 @@
+from .aggregate_core import RiskAggregator
+
+__all__ = ["RiskAggregator"]
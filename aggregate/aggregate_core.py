@@ -0,0 +1,299 @@
+import json
+import math
+import zlib
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..common.batch import group_codes
+
+_FORMAT = "risk_aggregator/1"
+
+
+class _LogBuckets:
+    """
+    Fixed log-spaced buckets with a relative-accuracy guarantee (DDSketch layout).
+
+    Values with |x| below `min_value` share a zero bucket; |x| above `max_value` is
+    clamped into the outermost bucket. Bucket order follows value order, so counts
+    from any number of chunks or shards merge by plain addition.
+    """
+
+    def __init__(self, relative_accuracy: float, min_value: float, max_value: float):
+        self.gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.lo = math.floor(math.log(min_value) / self.log_gamma)
+        self.hi = math.ceil(math.log(max_value) / self.log_gamma)
+        self.per_sign = self.hi - self.lo + 1
+        self.size = 2 * self.per_sign + 1
+
+    def index(self, x: np.ndarray) -> np.ndarray:
+        a = np.abs(x)
+        with np.errstate(divide="ignore"):
+            e = np.ceil(np.log(np.maximum(a, self.min_value)) / self.log_gamma)
+        k = np.clip(e, self.lo, self.hi).astype(np.int64) - self.lo
+        m = self.per_sign
+        return np.where(a < self.min_value, m, np.where(x > 0, m + 1 + k, m - 1 - k))
+
+    def value(self, bucket: int) -> float:
+        m = self.per_sign
+        if bucket == m:
+            return 0.0
+        k = bucket - m - 1 if bucket > m else m - 1 - bucket
+        v = 2.0 * self.gamma ** (k + self.lo) / (self.gamma + 1.0)
+        return v if bucket > m else -v
+
+
+class RiskAggregator:
+    """
+    Mergeable per-subgroup summaries of calculator outputs, built chunk by chunk.
+
+    metrics: {name: spec}, where spec is one of
+      {"thresholds": [...], "edges": [...]}   continuous output (risk %, score, LP):
+                                              count, mean, sd, min, max, quantile sketch,
+                                              counts at/above each threshold and an
+                                              optional fixed histogram over `edges`
+      {"categories": k}                       integer codes 0..k-1 (e.g. CLivD
+                                              risk_group_15y, COPD flag): counts per code
+    group_names: names of the grouping columns passed to `update` (e.g. region, sex,
+                 age_band, practice); keys in results are tuples in this order.
+
+    State size per group is fixed by the configuration, never by the number of rows.
+    Partial aggregators from chunks, processes or machines combine with `merge`
+    (or after `to_bytes`/`from_bytes`), giving the same counts, sketches and histograms
+    as one pass (sums differ only by floating-point summation order).
+    """
+
+    def __init__(
+        self,
+        metrics: Mapping[str, Mapping],
+        group_names: Sequence[str] = (),
+        relative_accuracy: float = 0.01,
+        value_range: Tuple[float, float] = (1e-4, 1e4),
+    ):
+        # normalized through JSON so specs compare equal after a to_bytes round trip
+        self.metrics = json.loads(json.dumps({name: dict(spec) for name, spec in metrics.items()}))
+        self.group_names = tuple(group_names)
+        self.relative_accuracy = float(relative_accuracy)
+        self.value_range = (float(value_range[0]), float(value_range[1]))
+        self._buckets = _LogBuckets(self.relative_accuracy, *self.value_range)
+        self._slots: Dict[Tuple, int] = {}
+        self._state: Dict[str, Dict[str, np.ndarray]] = {
+            name: self._empty(spec, 0) for name, spec in self.metrics.items()
+        }
+
+    # ---- state layout -------------------------------------------------------
+
+    def _empty(self, spec: Mapping, rows: int) -> Dict[str, np.ndarray]:
+        if "categories" in spec:
+            return {"counts": np.zeros((rows, int(spec["categories"])), dtype=np.int64)}
+        return {
+            "count": np.zeros(rows, dtype=np.int64),
+            "sum": np.zeros(rows),
+            "sum_sq": np.zeros(rows),
+            "min": np.full(rows, np.inf),
+            "max": np.full(rows, -np.inf),
+            "sketch": np.zeros((rows, self._buckets.size), dtype=np.int64),
+            "above": np.zeros((rows, len(spec.get("thresholds", ()))), dtype=np.int64),
+            "hist": np.zeros((rows, len(spec.get("edges", ())) + 1), dtype=np.int64),
+        }
+
+    def _slot_rows(self, keys) -> np.ndarray:
+        """Slot index per key, adding (and growing state for) unseen keys."""
+        rows = np.empty(len(keys), dtype=np.int64)
+        for i, key in enumerate(keys):
+            if key not in self._slots:
+                self._slots[key] = len(self._slots)
+            rows[i] = self._slots[key]
+        needed = len(self._slots)
+        for name, spec in self.metrics.items():
+            state = self._state[name]
+            have = next(iter(state.values())).shape[0]
+            if needed > have:
+                extra = self._empty(spec, max(needed, 2 * have) - have)
+                for field in state:
+                    state[field] = np.concatenate([state[field], extra[field]])
+        return rows
+
+    # ---- building -----------------------------------------------------------
+
+    def update(self, values: Mapping[str, object], groups: Optional[Mapping[str, object]] = None):
+        """Add one chunk: `values` holds an array per metric, `groups` one per group name."""
+        groups = groups or {}
+        if set(groups) != set(self.group_names):
+            raise ValueError(f"Expected group columns {list(self.group_names)}, got {list(groups)}.")
+        arrays = {name: np.asarray(values[name]).reshape(-1) for name in self.metrics}
+        n = next(iter(arrays.values())).shape[0] if arrays else 0
+        codes, keys = group_codes({g: groups[g] for g in self.group_names}, n)
+        slot = self._slot_rows(keys)
+        n_local = len(keys)
+
+        for name, spec in self.metrics.items():
+            state = self._state[name]
+            x = arrays[name]
+            if "categories" in spec:
+                k = int(spec["categories"])
+                c = x.astype(np.int64)
+                ok = (c >= 0) & (c < k)
+                local = np.bincount(codes[ok] * k + c[ok], minlength=n_local * k)
+                state["counts"][slot] += local.reshape(n_local, k)
+                continue
+
+            x = x.astype(float)
+            ok = np.isfinite(x)
+            g, x = codes[ok], x[ok]
+            state["count"][slot] += np.bincount(g, minlength=n_local)
+            state["sum"][slot] += np.bincount(g, weights=x, minlength=n_local)
+            state["sum_sq"][slot] += np.bincount(g, weights=x * x, minlength=n_local)
+            lo = np.full(n_local, np.inf)
+            hi = np.full(n_local, -np.inf)
+            np.minimum.at(lo, g, x)
+            np.maximum.at(hi, g, x)
+            state["min"][slot] = np.minimum(state["min"][slot], lo)
+            state["max"][slot] = np.maximum(state["max"][slot], hi)
+
+            nb = self._buckets.size
+            pairs, counts = np.unique(g * nb + self._buckets.index(x), return_counts=True)
+            np.add.at(state["sketch"], (slot[pairs // nb], pairs % nb), counts)
+
+            for j, t in enumerate(spec.get("thresholds", ())):
+                state["above"][slot, j] += np.bincount(g, weights=x >= t, minlength=n_local).astype(np.int64)
+            edges = np.asarray(spec.get("edges", ()), dtype=float)
+            nh = edges.size + 1
+            bins = np.searchsorted(edges, x, side="right")
+            state["hist"][slot] += np.bincount(g * nh + bins, minlength=n_local * nh).reshape(n_local, nh)
+        return self
+
+    def _check_compatible(self, other: "RiskAggregator") -> None:
+        if (
+            other.metrics != self.metrics
+            or other.group_names != self.group_names
+            or other.relative_accuracy != self.relative_accuracy
+            or other.value_range != self.value_range
+        ):
+            raise ValueError("Aggregators have different metrics, groups or sketch settings.")
+
+    def _fold(self, mine: np.ndarray, source: Dict[str, Dict[str, np.ndarray]], theirs: np.ndarray) -> None:
+        """Combine rows `theirs` of `source` state into rows `mine` (repeats allowed)."""
+        for name in self.metrics:
+            for field, arr in self._state[name].items():
+                ufunc = {"min": np.minimum, "max": np.maximum}.get(field, np.add)
+                ufunc.at(arr, mine, source[name][field][theirs])
+
+    def merge(self, other: "RiskAggregator") -> "RiskAggregator":
+        """Fold another aggregator's state into this one (in place); returns self."""
+        self._check_compatible(other)
+        keys = list(other._slots)
+        if keys:
+            theirs = np.array([other._slots[k] for k in keys], dtype=np.int64)
+            self._fold(self._slot_rows(keys), other._state, theirs)
+        return self
+
+    def rollup(self, group_names: Sequence[str]) -> "RiskAggregator":
+        """A coarser aggregator keyed by a subset of the group names (e.g. region only)."""
+        keep = [self.group_names.index(g) for g in group_names]
+        out = RiskAggregator(self.metrics, group_names, self.relative_accuracy, self.value_range)
+        keys = list(self._slots)
+        if keys:
+            theirs = np.array([self._slots[k] for k in keys], dtype=np.int64)
+            mine = out._slot_rows([tuple(k[i] for i in keep) for k in keys])
+            out._fold(mine, self._state, theirs)
+        return out
+
+    # ---- results ------------------------------------------------------------
+
+    def _quantiles(self, sketch: np.ndarray, lo: float, hi: float, quantiles: Sequence[float]):
+        total = sketch.sum()
+        cum = np.cumsum(sketch)
+        out = {}
+        for q in quantiles:
+            rank = q * (total - 1)
+            b = int(np.searchsorted(cum, rank, side="right"))
+            out[q] = float(min(max(self._buckets.value(b), lo), hi))
+        return out
+
+    def summary(self, quantiles: Sequence[float] = (0.05, 0.25, 0.5, 0.75, 0.95)) -> Dict[Tuple, Dict]:
+        """
+        {group_key: {metric: stats}}. Continuous stats: count, mean, sd, min, max,
+        quantiles {q: value} (within the relative accuracy), above {threshold:
+        proportion}, histogram (counts over edges). Categorical: count, counts.
+        """
+        out: Dict[Tuple, Dict] = {}
+        for key, row in sorted(self._slots.items(), key=lambda kv: kv[1]):
+            entry = {}
+            for name, spec in self.metrics.items():
+                state = self._state[name]
+                if "categories" in spec:
+                    counts = state["counts"][row]
+                    entry[name] = {"count": int(counts.sum()), "counts": counts.tolist()}
+                    continue
+                n = int(state["count"][row])
+                if n == 0:
+                    entry[name] = {"count": 0}
+                    continue
+                mean = state["sum"][row] / n
+                var = max(state["sum_sq"][row] / n - mean * mean, 0.0)
+                lo, hi = float(state["min"][row]), float(state["max"][row])
+                entry[name] = {
+                    "count": n,
+                    "mean": float(mean),
+                    "sd": math.sqrt(var * n / (n - 1)) if n > 1 else 0.0,
+                    "min": lo,
+                    "max": hi,
+                    "quantiles": self._quantiles(state["sketch"][row], lo, hi, quantiles),
+                    "above": {
+                        t: float(c) / n for t, c in zip(spec.get("thresholds", ()), state["above"][row])
+                    },
+                    "histogram": state["hist"][row].tolist(),
+                }
+            out[key] = entry
+        return out
+
+    # ---- serialization ------------------------------------------------------
+
+    def to_bytes(self) -> bytes:
+        """Compact, zlib-compressed JSON state (sketches stored sparsely)."""
+        groups = []
+        for key, row in self._slots.items():
+            fields = {}
+            for name in self.metrics:
+                fields[name] = {}
+                for field, arr in self._state[name].items():
+                    v = arr[row]
+                    if field == "sketch":
+                        nz = np.flatnonzero(v)
+                        fields[name][field] = [nz.tolist(), v[nz].tolist()]
+                    elif v.ndim:
+                        fields[name][field] = v.tolist()
+                    else:
+                        fields[name][field] = v.item() if math.isfinite(v) else None
+            groups.append({"key": list(key), "state": fields})
+        doc = {
+            "format": _FORMAT,
+            "metrics": self.metrics,
+            "group_names": list(self.group_names),
+            "relative_accuracy": self.relative_accuracy,
+            "value_range": list(self.value_range),
+            "groups": groups,
+        }
+        return zlib.compress(json.dumps(doc, separators=(",", ":")).encode("utf-8"))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "RiskAggregator":
+        doc = json.loads(zlib.decompress(data).decode("utf-8"))
+        if doc.get("format") != _FORMAT:
+            raise ValueError(f"Unsupported aggregator format {doc.get('format')!r}.")
+        agg = cls(doc["metrics"], doc["group_names"], doc["relative_accuracy"], tuple(doc["value_range"]))
+        rows = agg._slot_rows([tuple(g["key"]) for g in doc["groups"]])
+        for row, g in zip(rows, doc["groups"]):
+            for name, fields in g["state"].items():
+                state = agg._state[name]
+                for field, v in fields.items():
+                    if field == "sketch":
+                        state[field][row, v[0]] = v[1]
+                    elif v is None:
+                        continue
+                    else:
+                        state[field][row] = v
+        return agg
@@ -0,0 +1,23 @@
+from .backends_core import (
+    FLOAT32_BOUNDS,
+    available_backends,
+    check_parity,
+    check_precision,
+    get_scorer,
+    register_backend,
+    resolve_backend,
+    sample_inputs,
+    score,
+)
+
+__all__ = [
+    "FLOAT32_BOUNDS",
+    "available_backends",
+    "check_parity",
+    "check_precision",
+    "get_scorer",
+    "register_backend",
+    "resolve_backend",
+    "sample_inputs",
+    "score",
+]
@@ -0,0 +1,260 @@
+import importlib
+from typing import Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+import numpy as np
+
+from ..common.models import MODELS, get_model, input_names
+
+# Scoring backends by name. A loader returns {model name: batch scorer} and raises
+# ImportError when the backend's dependency is missing; it is called on first use.
+_LOADERS: Dict[str, Callable[[], Dict[str, Callable]]] = {}
+_LOADED: Dict[str, Dict[str, Callable]] = {}
+_UNAVAILABLE: Dict[str, str] = {}
+
+# Preferred order for backend="auto"; "numpy" always works. Per model, Numba comes
+# first only where its fused kernel is clearly faster than the NumPy scorer (CKD-PC,
+# CLivD: ~2x and up); SCORE2, PLCOm2012 and the points models gain little or nothing
+# (within run-to-run noise), so they stay on NumPy.
+_AUTO_ORDER: Tuple[str, ...] = ("numba", "numpy")
+_MODEL_AUTO_ORDER: Dict[str, Tuple[str, ...]] = {
+    "ckdpc": ("numba", "numpy"),
+    "clivd": ("numba", "numpy"),
+}
+
+# Maximum absolute error allowed for precision="float32" against float64, per output:
+# 0.01 percentage points of risk (1e-4 as a probability, 1e-4 on linear predictors).
+FLOAT32_BOUNDS: Dict[str, Dict[str, float]] = {
+    "score2": {"risk_10y": 0.01},
+    "ckdpc": {"risk_5y": 0.01},
+    "gdrs": {"risk_5y": 0.01},
+    "plcom2012": {"risk_6y": 0.01, "prob_6y": 1e-4, "linear_predictor": 1e-4},
+}
+
+
+def register_backend(name: str, loader: Callable[[], Dict[str, Callable]]) -> None:
+    """Register a backend: `loader()` returns {model name: scorer} with the batch scorers' signatures."""
+    _LOADERS[name] = loader
+    _LOADED.pop(name, None)
+    _UNAVAILABLE.pop(name, None)
+
+
+def _load_numba() -> Dict[str, Callable]:
+    return importlib.import_module(".numba_backend", __package__).SCORERS
+
+
+register_backend("numpy", lambda: {name: spec["scorer"] for name, spec in MODELS.items()})
+register_backend("numba", _load_numba)
+
+
+def _scorers(name: str) -> Dict[str, Callable]:
+    if name not in _LOADERS:
+        raise KeyError(f"Unknown backend {name!r}. Available: {sorted(_LOADERS)}")
+    if name in _LOADED:
+        return _LOADED[name]
+    if name in _UNAVAILABLE:
+        raise ImportError(_UNAVAILABLE[name])
+    try:
+        _LOADED[name] = _LOADERS[name]()
+    except ImportError as e:
+        _UNAVAILABLE[name] = f"Backend {name!r} is not available: {e}"
+        raise ImportError(_UNAVAILABLE[name]) from e
+    return _LOADED[name]
+
+
+def available_backends() -> Dict[str, bool]:
+    """{backend name: whether it loads here} (loads each backend once)."""
+    status = {}
+    for name in _LOADERS:
+        try:
+            _scorers(name)
+            status[name] = True
+        except ImportError:
+            status[name] = False
+    return status
+
+
+def resolve_backend(backend: str = "auto", model: Optional[str] = None) -> str:
+    """
+    Backend name to use. "auto" picks the first available of numba, numpy, or with
+    `model` the first available in that model's preference (NumPy for the models
+    where Numba is not faster); an explicitly requested backend that cannot load
+    raises ImportError.
+    """
+    if backend != "auto":
+        _scorers(backend)
+        return backend
+    order = _AUTO_ORDER if model is None else _MODEL_AUTO_ORDER.get(model, ("numpy",))
+    for name in order:
+        try:
+            _scorers(name)
+            return name
+        except ImportError:
+            continue
+    return "numpy"
+
+
+def get_scorer(name: str, backend: str = "auto") -> Callable:
+    """Batch scorer for model `name` from `backend` (the NumPy scorer if the backend lacks the model)."""
+    get_model(name)
+    scorers = _scorers(resolve_backend(backend, name))
+    return scorers.get(name, MODELS[name]["scorer"])
+
+
+def score(
+    name: str,
+    inputs: Mapping[str, object],
+    bundle: Dict,
+    backend: str = "auto",
+    **options,
+) -> Dict[str, np.ndarray]:
+    """
+    `common.models.score_model` on a chosen backend: {output name: array}.
+
+    Contribution matrices and float32 precision are only supported by the NumPy
+    scorers, so calls using them always use the NumPy scorers. Precomputed `tables`
+    (from `MODELS[name]["prepare"]`) are accepted by every backend.
+    """
+    spec = get_model(name)
+    numpy_only = options.get("contributions") or options.get("precision", "float64") != "float64"
+    scorer = spec["scorer"] if numpy_only else get_scorer(name, backend)
+    columns = {k: inputs[k] for k in input_names(name) if k in inputs}
+    result = scorer(**columns, bundle=bundle, **options)
+    if not isinstance(result, dict):
+        result = {spec["outputs"][0]: result}
+    out = {k: np.asarray(result[k]) for k in spec["outputs"]}
+    if "contributions" in result:
+        out["contributions"] = result["contributions"]
+        out["terms"] = result["terms"]
+    return out
+
+
+def sample_inputs(name: str, n: int = 10000, seed: int = 0) -> Dict[str, np.ndarray]:
+    """
+    Random input columns for model `name` covering its validated domain (all
+    categories, both sub-models, missing ACR / quit time), for parity checks and
+    benchmarks.
+    """
+    rng = np.random.default_rng(seed)
+
+    def pick(*values):
+        return rng.choice(values, n)
+
+    def flag():
+        return rng.integers(0, 2, n)
+
+    if name == "ckdpc":
+        return {
+            "diabetes": flag(), "age": rng.uniform(30, 80, n), "sex": pick("male", "female"), "black": flag(),
+            "egfr": rng.uniform(40, 130, n), "history_cvd": flag(), "ever_smoker": flag(), "hypertensive": flag(),
+            "bmi": rng.uniform(18, 45, n), "acr_mg_g": np.where(rng.random(n) < 0.2, np.nan, rng.uniform(1, 300, n)),
+            "hba1c": rng.uniform(5, 11, n), "dm_medication_status": pick("oral", "insulin", "no_meds"),
+        }
+    if name == "gdrs":
+        return {
+            "age": rng.uniform(30, 80, n), "height": rng.uniform(150, 200, n), "waist": rng.uniform(60, 130, n),
+            "hypertension": flag(), "exercise": rng.uniform(0, 10, n),
+            "smoking": pick("never", "former_lt20", "former_ge20", "current_lt20", "current_ge20"),
+            "wholegrains": rng.uniform(0, 300, n), "coffee": rng.uniform(0, 600, n), "redmeat": rng.uniform(0, 200, n),
+            "diabetes_one_parent": flag(), "diabetes_both_parents": flag(), "diabetes_sibling": flag(),
+            "hba1c": rng.uniform(4.5, 7, n),
+        }
+    if name == "score2":
+        return {
+            "age": rng.uniform(40, 69, n), "sex": pick("male", "female"), "smoker": flag(),
+            "sbp": rng.uniform(90, 200, n), "tchol": rng.uniform(3, 9, n), "hdl": rng.uniform(0.6, 2.5, n),
+            "region": pick("low", "moderate", "high", "very_high"),
+        }
+    if name == "caide":
+        return {
+            "age": rng.integers(39, 65, n), "sex": pick("male", "female"), "education_years": rng.integers(0, 20, n),
+            "sbp_mmHg": rng.uniform(100, 180, n), "bmi": rng.uniform(18, 40, n),
+            "total_chol_mmol_L": rng.uniform(3, 9, n), "physically_active": flag(),
+        }
+    if name == "clivd":
+        return {
+            "age": rng.uniform(30, 80, n), "sex": pick("male", "female"), "whr": rng.uniform(0.7, 1.2, n),
+            "alcohol": rng.uniform(0, 60, n), "ggt": rng.uniform(5, 300, n), "diabetes": flag(),
+            "smoking": pick("current", "never"),
+        }
+    if name == "plcom2012":
+        return {
+            "age_years": rng.uniform(50, 80, n),
+            "race": pick("white", "black", "hispanic", "asian", "american_indian_alaska_native",
+                         "native_hawaiian_pacific_islander"),
+            "education_level": rng.integers(1, 7, n), "bmi": rng.uniform(18, 40, n), "copd": flag(),
+            "personal_history_cancer": flag(), "family_history_lung_cancer": flag(),
+            "smoking_status": pick("current", "former"), "smoking_intensity_cigs_per_day": rng.uniform(1, 60, n),
+            "smoking_duration_years": rng.uniform(5, 60, n),
+            "quit_time_years": np.where(rng.random(n) < 0.1, np.nan, rng.uniform(0, 30, n)),
+        }
+    if name == "copd":
+        return {
+            "smoking_status": pick("current", "former", "never", "missing"), "asthma_history": flag(),
+            "lrti_count_3y": pick("0", "1", ">1"), "salbutamol_3y": flag(),
+        }
+    raise KeyError(f"No sample inputs for model {name!r}.")
+
+
+def check_parity(
+    backend: str = "numba",
+    reference: str = "numpy",
+    n: int = 10000,
+    seed: int = 0,
+    models: Optional[Iterable[str]] = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Score the same random inputs on two backends and compare every output.
+
+    Returns {model: {output: max absolute difference}} (category outputs compare
+    as numbers, so any mismatch shows as >= 1). Raises ImportError if either
+    backend cannot load.
+    """
+    resolve_backend(backend)
+    resolve_backend(reference)
+    report = {}
+    for name in models or MODELS:
+        bundle = MODELS[name]["load_bundle"]()
+        inputs = sample_inputs(name, n, seed)
+        got = score(name, inputs, bundle, backend=backend)
+        want = score(name, inputs, bundle, backend=reference)
+        report[name] = {out: _max_abs_diff(got[out], want[out]) for out in MODELS[name]["outputs"]}
+    return report
+
+
+def _max_abs_diff(a: np.ndarray, b: np.ndarray) -> float:
+    """Largest |a - b|, counting NaN in both as equal and NaN in one as infinite."""
+    a, b = a.astype(float), b.astype(float)
+    both_nan = np.isnan(a) & np.isnan(b)
+    diff = np.where(both_nan, 0.0, np.abs(a - b))
+    return float(np.max(np.where(np.isnan(diff), np.inf, diff), initial=0.0))
+
+
+def check_precision(
+    n: int = 200_000,
+    seeds: Iterable[int] = (0, 1, 2),
+    models: Optional[Iterable[str]] = None,
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Verify precision="float32" against the float64 scorers on random inputs over
+    each model's domain (`sample_inputs`, `n` rows per seed). Numeric inputs are
+    rounded to float32 first, so storage rounding is part of the measured error.
+
+    Returns {model: {output: {'max_abs_error', 'bound', 'ok'}}} for the models in
+    FLOAT32_BOUNDS; 'ok' is max_abs_error <= bound.
+    """
+    report: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for name in models or FLOAT32_BOUNDS:
+        bundle = MODELS[name]["load_bundle"]()
+        worst = dict.fromkeys(FLOAT32_BOUNDS[name], 0.0)
+        for seed in seeds:
+            inputs = sample_inputs(name, n, seed)
+            inputs32 = {k: v.astype(np.float32) if v.dtype.kind == "f" else v for k, v in inputs.items()}
+            want = score(name, inputs, bundle, backend="numpy")
+            got = score(name, inputs32, bundle, backend="numpy", precision="float32")
+            for out in worst:
+                worst[out] = max(worst[out], _max_abs_diff(got[out], want[out]))
+        report[name] = {
+            out: {"max_abs_error": err, "bound": FLOAT32_BOUNDS[name][out], "ok": err <= FLOAT32_BOUNDS[name][out]}
+            for out, err in worst.items()
+        }
+    return report
@@ -0,0 +1,80 @@
+"""
+Throughput and memory of the scoring backends.
+
+    python -m risk_calculators.backends.benchmark [rows]
+
+prints rows/second and peak temporary bytes per row for every model on every
+backend that loads here, followed by the parity check against NumPy and the
+float32 precision check.
+"""
+import sys
+import time
+import tracemalloc
+from typing import Dict, Iterable, Optional
+
+from ..common.models import MODELS
+from .backends_core import available_backends, check_parity, check_precision, sample_inputs, score
+
+
+def run_benchmark(
+    n: int = 200_000,
+    models: Optional[Iterable[str]] = None,
+    backends: Optional[Iterable[str]] = None,
+    repeats: int = 3,
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Time `backends.score` on `n` random rows per model (best of `repeats`, after one
+    warm-up call that also triggers JIT compilation).
+
+    Returns {model: {backend: {'rows_per_sec', 'peak_bytes_per_row'}}}; peak bytes
+    are the largest allocation high-water mark during one call (tracemalloc), outputs
+    included.
+    """
+    if backends is None:
+        backends = [name for name, ok in available_backends().items() if ok]
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for name in models or MODELS:
+        bundle = MODELS[name]["load_bundle"]()
+        inputs = sample_inputs(name, n)
+        results[name] = {}
+        for backend in backends:
+            score(name, inputs, bundle, backend=backend)
+            best = float("inf")
+            for _ in range(repeats):
+                start = time.perf_counter()
+                score(name, inputs, bundle, backend=backend)
+                best = min(best, time.perf_counter() - start)
+
+            tracemalloc.start()
+            score(name, inputs, bundle, backend=backend)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[name][backend] = {"rows_per_sec": n / best, "peak_bytes_per_row": peak / n}
+    return results
+
+
+def main(argv=None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 200_000
+    results = run_benchmark(n)
+
+    print(f"{'model':<10} {'backend':<8} {'rows/s':>14} {'peak B/row':>11}")
+    for name, by_backend in results.items():
+        for backend, r in by_backend.items():
+            print(f"{name:<10} {backend:<8} {r['rows_per_sec']:>14,.0f} {r['peak_bytes_per_row']:>11.1f}")
+
+    others = [b for b in next(iter(results.values()), {}) if b != "numpy"]
+    for backend in others:
+        print(f"\nmax |{backend} - numpy|:")
+        for name, diffs in check_parity(backend).items():
+            print(f"  {name:<10} " + ", ".join(f"{k}={v:.1e}" for k, v in diffs.items()))
+
+    print("\nmax |float32 - float64| (bound):")
+    for name, outputs in check_precision().items():
+        print(f"  {name:<10} " + ", ".join(
+            f"{k}={r['max_abs_error']:.1e} ({r['bound']:g}{'' if r['ok'] else ' EXCEEDED'})" for k, r in outputs.items()
+        ))
+
+
+if __name__ == "__main__":
+    main()
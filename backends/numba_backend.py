@@ -0,0 +1,492 @@
+"""
+Numba kernels for the batch scorers: one fused pass per row, no temporaries.
+
+Each scorer has the signature and return type of its `*_batch.py` counterpart,
+including `tables` (the bundle lookups from `MODELS[name]["prepare"]`, built from
+the bundle when omitted). Inputs are encoded with the same helpers as the NumPy
+path (category lookups, flags, None -> NaN), broadcast to a common shape and
+scored by a jitted loop that writes straight into the output arrays. Kernels
+release the GIL. Importing this module requires Numba; use
+`backends.get_scorer` for automatic fallback.
+"""
+from typing import Dict, Mapping, Optional, Tuple
+
+import numpy as np
+from numba import njit
+
+from ..caide.caide_batch import _MODEL_KEYS as _CAIDE_MODEL_KEYS, _banded_points
+from ..caide.caide_batch import _model_tables as _caide_model_tables
+from ..ckdpc.ckdpc_batch import DM_MEDS, batch_tables as _ckdpc_tables
+from ..clivd.clivd_batch import batch_tables as _clivd_tables
+from ..common.batch import as_flag, as_float, category_index
+from ..copd.copd_batch import batch_tables as _copd_tables
+from ..gdrs.gdrs_batch import batch_tables as _gdrs_tables
+from ..plcom2012.plcom2012_batch import RACES, _RACE_TERMS, batch_tables as _plco_tables
+from ..score2.score2_batch import LP_TERMS, SEXES, batch_tables as _score2_tables
+
+_jit = njit(cache=True, nogil=True)
+
+
+def _flat(*arrays) -> Tuple[Tuple[int, ...], list]:
+    """Broadcast arrays to their common shape; returns (shape, 1-D arrays)."""
+    arrays = [np.asarray(a) for a in arrays]
+    shape = np.broadcast_shapes(*(a.shape for a in arrays))
+    return shape, [np.broadcast_to(a, shape).reshape(-1) for a in arrays]
+
+
+def _term_index(terms, known) -> np.ndarray:
+    """Positions of the bundle's terms among the terms a kernel computes."""
+    idx = np.empty(len(terms), dtype=np.int64)
+    for j, name in enumerate(terms):
+        if name not in known:
+            raise KeyError(f"Context missing term '{name}'.")
+        idx[j] = known.index(name)
+    return idx
+
+
+# --- SCORE2 ---------------------------------------------------------------------------
+
+@_jit
+def _score2_kernel(age, sbp, tchol, hdl, smoke, r, s, betas, params, s0, out):
+    for i in range(age.shape[0]):
+        b = betas[r[i], s[i]]
+        cage = (age[i] - 60) / 5
+        csbp = (sbp[i] - 120) / 20
+        ctchol = (tchol[i] - 6) / 1
+        chdl = (hdl[i] - 1.3) / 0.5
+        sm = smoke[i]
+        lp = 0.0 + b[0] * cage
+        lp = lp + b[1] * sm
+        lp = lp + b[2] * csbp
+        lp = lp + b[3] * ctchol
+        lp = lp + b[4] * chdl
+        lp = lp + b[5] * (cage * sm)
+        lp = lp + b[6] * (cage * csbp)
+        lp = lp + b[7] * (cage * ctchol)
+        lp = lp + b[8] * (cage * chdl)
+
+        p_base = 1.0 - (s0[s[i]] ** np.exp(lp))
+        p_base = np.minimum(np.maximum(p_base, 1e-15), 1 - 1e-15)
+        x = np.log(-np.log(1.0 - p_base))
+        x_adj = params[r[i], s[i], 0] + params[r[i], s[i], 1] * x
+        out[i] = (1.0 - np.exp(-np.exp(x_adj))) * 100.0
+
+
+def score2_risk_batch(
+    age, sex, smoker, sbp, tchol, hdl, region, bundle: Dict, tables: Optional[Mapping] = None,
+) -> np.ndarray:
+    age = as_float(age)
+    if np.any(~((age >= 40) & (age <= 69))):
+        bad = age[~((age >= 40) & (age <= 69))]
+        raise ValueError(f"SCORE2 is only validated for ages 40–69 (got {bad.flat[0]})")
+
+    if tables is None:
+        tables = _score2_tables(bundle)
+    regions, betas, params = tables["regions"], tables["betas"], tables["params"]
+    table = np.stack([betas[name] for name in LP_TERMS], axis=-1)
+    r = category_index(region, regions, "region", lower=True)
+    s = category_index(sex, SEXES, "sex", lower=True)
+
+    shape, cols = _flat(age, as_float(sbp), as_float(tchol), as_float(hdl), as_flag(smoker), r, s)
+    out = np.empty(cols[0].shape[0])
+    _score2_kernel(*cols, table, params, np.array([0.9605, 0.9776]), out)
+    return out.reshape(shape)
+
+
+# --- CKD-PC ---------------------------------------------------------------------------
+
+_CKDPC_TERMS = (
+    "age_centered_per5", "female", "black", "egfr_low_component", "egfr_high_component",
+    "history_cvd", "ever_smoker", "hypertensive", "bmi_centered_per5", "albuminuria_term",
+    "hba1c_centered", "insulin_indicator", "no_meds_indicator",
+    "interaction_hba1c_insulin", "interaction_hba1c_no_meds",
+)
+
+
+@_jit
+def _ckdpc_kernel(diabetes, age, female, black, egfr, hcvd, smoker, htn, bmi, acr, hba1c, meds,
+                  idx, coefs, intercepts, gammas, out):
+    t = np.empty(15)
+    for i in range(age.shape[0]):
+        d = 1 if diabetes[i] > 0 else 0
+        t[0] = (age[i] / 5.0) - 11.0
+        t[1] = female[i]
+        t[2] = black[i]
+        t[3] = 15.0 - np.minimum(egfr[i], 90.0) / 5.0
+        t[4] = np.maximum(0.0, egfr[i] - 90.0) / 5.0
+        t[5] = hcvd[i]
+        t[6] = smoker[i]
+        t[7] = htn[i]
+        t[8] = (bmi[i] / 5.0) - 5.4
+
+        if d == 1:
+            center = 1.0
+        else:
+            center = (
+                0.6754442
+                + 0.0222581 * t[0]
+                + 0.0459020 * t[1]
+                - 0.0340495 * t[2]
+                + 0.0085871 * t[3]
+                - 0.0275825 * t[4]
+                + 0.0495695 * t[5]
+                + 0.0381086 * t[6]
+                + 0.1286836 * t[7]
+                + 0.0218783 * t[8]
+            )
+        a = acr[i]
+        t[9] = np.log10(a) - center if (np.isfinite(a) and a > 0) else 0.0
+
+        t[10] = hba1c[i] - 7.0 if d == 1 else 0.0
+        t[11] = float(d) * (1.0 if meds[i] == 1 else 0.0)
+        t[12] = float(d) * (1.0 if meds[i] == 2 else 0.0)
+        t[13] = t[10] * t[11]
+        t[14] = t[10] * t[12]
+
+        lp = intercepts[d]
+        for j in range(idx.shape[0]):
+            lp = lp + coefs[d, j] * t[idx[j]]
+        risk = 1.0 - np.exp(-(5.0 ** gammas[d]) * np.exp(lp))
+        out[i] = np.minimum(np.maximum(risk, 0.0), 1.0) * 100.0
+
+
+def ckdpc_risk_5y_batch(
+    diabetes, age, sex, black, egfr, history_cvd, ever_smoker, hypertensive, bmi,
+    acr_mg_g=None, bundle: Dict = None, hba1c=None, dm_medication_status="oral", tables: Optional[Mapping] = None,
+) -> np.ndarray:
+    if bundle is None:
+        raise ValueError("'bundle' is required (pass load_ckdpc_bundle()).")
+    if tables is None:
+        tables = _ckdpc_tables(bundle)
+    diabetes = as_flag(diabetes)
+    female = (category_index(sex, ("male", "female"), "sex", lower=True) == 1).astype(float)
+    if np.any(diabetes > 0):
+        if hba1c is None:
+            raise ValueError("For the diabetes model, 'hba1c' is required (% NGSP).")
+        if dm_medication_status is None:
+            raise ValueError("For the diabetes model, provide 'dm_medication_status' (oral|insulin|no_meds).")
+    hba1c = as_float(hba1c)
+    if np.any((diabetes > 0) & ~np.isfinite(hba1c)):
+        raise ValueError("For the diabetes model, 'hba1c' is required (% NGSP).")
+    meds = category_index("oral" if dm_medication_status is None else dm_medication_status,
+                          DM_MEDS, "dm_medication_status")
+
+    terms = tables["terms"]
+
+    shape, cols = _flat(
+        diabetes, as_float(age), female, as_flag(black), as_float(egfr), as_flag(history_cvd),
+        as_flag(ever_smoker), as_flag(hypertensive), as_float(bmi), as_float(acr_mg_g), hba1c, meds,
+    )
+    out = np.empty(cols[0].shape[0])
+    _ckdpc_kernel(*cols, _term_index(terms, _CKDPC_TERMS), tables["coefs"], tables["intercepts"], tables["gammas"], out)
+    return out.reshape(shape)
+
+
+# --- CLivD ----------------------------------------------------------------------------
+
+_CLIVD_TERMS = (
+    "age", "waist_hip_ratio_x10", "alcohol_linear",
+    "alcohol_spline_s1", "alcohol_spline_s2", "alcohol_spline_s3", "alcohol_spline_s4", "alcohol_spline_s5",
+    "ggt", "female_indicator", "diabetes_yes", "smoking_current",
+    "interaction_female_x_ggt", "interaction_female_x_smoking",
+)
+
+
+@_jit
+def _clivd_kernel(age, female, whr, alcohol, ggt, diabetes, current, alc_max, ggt_max,
+                  idx, coefs, intercept, lp_out, hr_out, group_out):
+    t = np.empty(14)
+    for i in range(age.shape[0]):
+        alc = np.minimum(np.maximum(alcohol[i], 0.0), alc_max)
+        g = np.minimum(np.maximum(ggt[i], 0.0), ggt_max)
+        s1 = np.maximum(alc - 0.1, 0.0)
+        s2 = np.maximum(alc - 1.0, 0.0)
+        s3 = np.maximum(alc - 3.0, 0.0)
+        s4 = np.maximum(alc - 9.0, 0.0)
+        s5 = np.maximum(alc - 33.0, 0.0)
+        t[0] = age[i]
+        t[1] = whr[i] * 10.0
+        t[2] = alc
+        t[3] = s1 * s1 * s1
+        t[4] = s2 * s2 * s2
+        t[5] = s3 * s3 * s3
+        t[6] = s4 * s4 * s4
+        t[7] = s5 * s5 * s5
+        t[8] = g
+        t[9] = female[i]
+        t[10] = diabetes[i]
+        t[11] = current[i]
+        t[12] = g * female[i]
+        t[13] = female[i] * current[i]
+
+        lp = intercept
+        for j in range(idx.shape[0]):
+            lp = lp + coefs[j] * t[idx[j]]
+        lp_out[i] = lp
+        hr_out[i] = np.exp(lp)
+        group_out[i] = (lp >= -0.258) + (lp > 2.066) + (lp > 2.784)
+
+
+def clivd_modellab_score_batch(
+    age, sex, whr, alcohol, ggt, diabetes, smoking, bundle: Dict = None, tables: Optional[Mapping] = None,
+):
+    if bundle is None:
+        raise ValueError("'bundle' is required (pass load_clivd_bundle()).")
+    if tables is None:
+        tables = _clivd_tables(bundle)
+    terms = tables["terms"]
+    coefs = np.array([tables["coefs"][name] for name in terms])
+
+    female = (np.asarray(sex) == "female").astype(float)
+    current = (np.asarray(smoking) == "current").astype(float)
+    shape, cols = _flat(as_float(age), female, as_float(whr), as_float(alcohol), as_float(ggt),
+                        as_flag(diabetes), current)
+    n = cols[0].shape[0]
+    lp, hr, group = np.empty(n), np.empty(n), np.empty(n, dtype=np.int8)
+    _clivd_kernel(
+        *cols,
+        tables["alcohol_max"], tables["ggt_max"],
+        _term_index(terms, _CLIVD_TERMS), coefs, tables["intercept"], lp, hr, group,
+    )
+    return {
+        "linear_predictor": lp.reshape(shape),
+        "hazard_ratio": hr.reshape(shape),
+        "risk_group_15y": group.reshape(shape),
+    }
+
+
+# --- PLCOm2012 ------------------------------------------------------------------------
+
+_PLCO_TERMS = (
+    "age_centered", "education_centered", "bmi_centered", "copd_yes", "personal_cancer_yes",
+    "family_lung_cancer_yes", "smoking_current", "smoking_intensity_term", "smoking_duration_centered",
+    "quit_time_centered",
+) + _RACE_TERMS
+
+
+@_jit
+def _plco_kernel(age, race, edu, bmi, copd, cancer, family, current, cigs, duration, quit,
+                 consts, idx, coefs, intercept, risk_out, prob_out, lp_out):
+    t = np.empty(15)
+    for i in range(age.shape[0]):
+        qt = quit[i]
+        if current[i] > 0 or not np.isfinite(qt):
+            qt = 0.0
+        x = np.maximum(cigs[i] / 10.0, 1e-6)
+        t[0] = age[i] - consts[0]
+        t[1] = edu[i] - consts[1]
+        t[2] = bmi[i] - consts[2]
+        t[3] = copd[i]
+        t[4] = cancer[i]
+        t[5] = family[i]
+        t[6] = current[i]
+        t[7] = (x ** -1.0) - consts[5]
+        t[8] = duration[i] - consts[3]
+        t[9] = qt - consts[4]
+        for k in range(5):
+            t[10 + k] = 1.0 if race[i] == k + 1 else 0.0
+
+        lp = intercept
+        for j in range(idx.shape[0]):
+            lp = lp + coefs[j] * t[idx[j]]
+        prob = np.minimum(np.maximum(1.0 / (1.0 + np.exp(-lp)), 0.0), 1.0)
+        risk_out[i] = prob * 100.0
+        prob_out[i] = prob
+        lp_out[i] = lp
+
+
+def plcom2012_risk_6y_batch(
+    age_years, race, education_level, bmi, copd, personal_history_cancer, family_history_lung_cancer,
+    smoking_status, smoking_intensity_cigs_per_day, smoking_duration_years, quit_time_years,
+    bundle: Dict = None, tables: Optional[Mapping] = None,
+):
+    if bundle is None:
+        raise ValueError("'bundle' is required (pass load_plcom2012_bundle()).")
+    if tables is None:
+        tables = _plco_tables(bundle)
+    terms = tables["terms"]
+    coefs = np.array([tables["coefs"][name] for name in terms])
+
+    # race as an index into RACES; unrecognised races get no race term, as in the NumPy path
+    race = np.asarray(race)
+    race_code = np.full(race.shape, -1, dtype=np.int8)
+    for k, code in enumerate(RACES):
+        race_code[race == code] = k
+    current = (np.asarray(smoking_status) == "current").astype(float)
+
+    shape, cols = _flat(
+        as_float(age_years), race_code, as_float(education_level), as_float(bmi), as_flag(copd),
+        as_flag(personal_history_cancer), as_flag(family_history_lung_cancer), current,
+        as_float(smoking_intensity_cigs_per_day), as_float(smoking_duration_years), as_float(quit_time_years),
+    )
+    n = cols[0].shape[0]
+    risk, prob, lp = np.empty(n), np.empty(n), np.empty(n)
+    _plco_kernel(*cols, np.array(tables["constants"]), _term_index(terms, _PLCO_TERMS), coefs,
+                 tables["intercept"], risk, prob, lp)
+    return {
+        "risk_6y": risk.reshape(shape),
+        "prob_6y": prob.reshape(shape),
+        "linear_predictor": lp.reshape(shape),
+    }
+
+
+# --- GDRS -----------------------------------------------------------------------------
+
+@_jit
+def _gdrs_kernel(age, height, waist, htn, exercise, smoke_pts, wholegrains, coffee, redmeat,
+                 one, both, sibling, hba1c, p, out):
+    # p: ppu age, height, waist, exercise, wholegrains, coffee, redmeat; per wholegrains,
+    #    coffee, redmeat; points hypertension, one parent, both parents, sibling;
+    #    original-points and HbA1c multipliers, intercept, S0, mean points, scale
+    for i in range(age.shape[0]):
+        b = both[i]
+        o = one[i] * (1.0 - b)
+        parents = p[12] * b + p[11] * o
+        cp = p[16]
+        cp = cp + p[14] * (p[0] * age[i])
+        cp = cp + p[14] * (p[1] * height[i])
+        cp = cp + p[14] * (p[2] * waist[i])
+        cp = cp + p[14] * (p[10] * htn[i])
+        cp = cp + p[14] * (p[3] * exercise[i])
+        cp = cp + p[14] * smoke_pts[i]
+        cp = cp + p[14] * (p[4] * (wholegrains[i] / p[7]))
+        cp = cp + p[14] * (p[5] * (coffee[i] / p[8]))
+        cp = cp + p[14] * (p[6] * (redmeat[i] / p[9]))
+        cp = cp + p[14] * parents
+        cp = cp + p[14] * (p[13] * sibling[i])
+        cp = cp + p[15] * hba1c[i]
+        out[i] = (1.0 - (p[17] ** np.exp((cp - p[18]) / p[19]))) * 100.0
+
+
+def gdrs_batch(
+    age, height, waist, hypertension, exercise, smoking, wholegrains, coffee, redmeat,
+    diabetes_one_parent, diabetes_both_parents, diabetes_sibling, hba1c, bundle: Dict,
+    tables: Optional[Mapping] = None,
+) -> np.ndarray:
+    if tables is None:
+        tables = _gdrs_tables(bundle)
+    smoke_pts = tables["smoking_points"][category_index(smoking, tables["smoking_codes"], "smoking category")]
+
+    ppu, per, points = tables["points_per_unit"], tables["per"], tables["points_if_true"]
+    params = np.array(
+        [ppu[n] for n in ("age", "height", "waist", "exercise", "wholegrains", "coffee", "redmeat")]
+        + [per[n] for n in ("wholegrains", "coffee", "redmeat")]
+        + [points[n] for n in ("hypertension", "diabetes_one_parent", "diabetes_both_parents", "diabetes_sibling")]
+        + [
+            tables["original_points_mult"], tables["hba1c_mult"], tables["intercept"],
+            tables["baseline_survival"], tables["mean_points"], tables["scale"],
+        ]
+    )
+
+    shape, cols = _flat(
+        as_float(age), as_float(height), as_float(waist), as_flag(hypertension), as_float(exercise), smoke_pts,
+        as_float(wholegrains), as_float(coffee), as_float(redmeat), as_flag(diabetes_one_parent),
+        as_flag(diabetes_both_parents), as_flag(diabetes_sibling), as_float(hba1c),
+    )
+    out = np.empty(cols[0].shape[0])
+    _gdrs_kernel(*cols, params, out)
+    return out.reshape(shape)
+
+
+# --- CAIDE ----------------------------------------------------------------------------
+
+@_jit
+def _caide_kernel(age_pts, edu_pts, sex_pts, sbp, bmi, chol, active, apoe_pts, p, out):
+    # p: thresholds sbp, bmi, chol; points sbp, bmi, chol, inactive; logit beta0 + beta1, beta2
+    for i in range(age_pts.shape[0]):
+        pts = 0.0 + age_pts[i]
+        pts = pts + edu_pts[i]
+        pts = pts + sex_pts[i]
+        pts = pts + p[3] * (1.0 if sbp[i] > p[0] else 0.0)
+        pts = pts + p[4] * (1.0 if bmi[i] > p[1] else 0.0)
+        pts = pts + p[5] * (1.0 if chol[i] > p[2] else 0.0)
+        pts = pts + p[6] * (1.0 if active[i] == 0 else 0.0)
+        pts = pts + apoe_pts[i]
+        logit = p[7] + p[8] * pts
+        out[i] = 1.0 / (1.0 + np.exp(-logit)) * 100.0
+
+
+def caide_batch(
+    age, sex, education_years, sbp_mmHg, bmi, total_chol_mmol_L, physically_active,
+    apoe_status=None, model: str = "basic", bundle: Dict = None, tables: Optional[Mapping] = None,
+) -> np.ndarray:
+    kind = "basic" if model == "basic" else "apoe"
+    if _CAIDE_MODEL_KEYS[kind] not in bundle:
+        raise KeyError(f"Model {model!r} not found in bundle.")
+    t = _caide_model_tables(bundle[_CAIDE_MODEL_KEYS[kind]]) if tables is None else tables[kind]
+
+    def categorical_points(name: str, codes) -> np.ndarray:
+        if name not in t:
+            raise KeyError(name)
+        cats, table = t[name]
+        return table[category_index(codes, cats, f"category for {name}")]
+
+    apoe_pts = np.zeros(())
+    if model == "apoe":
+        if apoe_status is None:
+            raise ValueError("apoe_status must be provided when model='apoe' (use 'non_e4' or 'e4').")
+        apoe_pts = categorical_points("apoe_status", apoe_status)
+
+    thresholds, points = t["thresholds"], t["points_if_true"]
+    names = ("sbp_over_140", "bmi_over_30", "total_chol_over_6_5")
+    params = np.array(
+        [thresholds[n] for n in names] + [points[n] for n in names + ("physically_inactive",)]
+        + [t["beta0"] + t["beta1"], t["beta2"]]
+    )
+
+    shape, cols = _flat(
+        _banded_points(as_float(age), t["age_bands"]), _banded_points(as_float(education_years), t["education_bands"]),
+        categorical_points("sex", sex), as_float(sbp_mmHg), as_float(bmi), as_float(total_chol_mmol_L),
+        as_flag(physically_active), apoe_pts,
+    )
+    out = np.empty(cols[0].shape[0])
+    _caide_kernel(*cols, params, out)
+    return out.reshape(shape)
+
+
+# --- COPD -----------------------------------------------------------------------------
+
+@_jit
+def _copd_kernel(smoke_pts, asthma, lrti_pts, salbutamol, asthma_coef, salbutamol_coef, threshold,
+                 score_out, above_out):
+    for i in range(smoke_pts.shape[0]):
+        score = 0.0 + 1.0 * smoke_pts[i]
+        score = score + asthma_coef * asthma[i]
+        score = score + 1.0 * lrti_pts[i]
+        score = score + salbutamol_coef * salbutamol[i]
+        score_out[i] = score
+        above_out[i] = score >= threshold
+
+
+def copd_casefinding_score_batch(
+    smoking_status, asthma_history, lrti_count_3y, salbutamol_3y, bundle: Dict, threshold: float = 2.5,
+    tables: Optional[Mapping] = None,
+):
+    if tables is None:
+        tables = _copd_tables(bundle)
+    smoking_codes, smoking_table = tables["smoking_codes"], tables["smoking_points"]
+    lrti_codes, lrti_table = tables["lrti_codes"], tables["lrti_points"]
+    weights = tables["weights"]
+
+    shape, cols = _flat(
+        smoking_table[category_index(smoking_status, smoking_codes, "smoking_status", lower=True)],
+        as_flag(asthma_history),
+        lrti_table[category_index(lrti_count_3y, lrti_codes, "lrti_count_3y")],
+        as_flag(salbutamol_3y),
+    )
+    n = cols[0].shape[0]
+    score, above = np.empty(n), np.empty(n, dtype=np.bool_)
+    _copd_kernel(*cols, weights["asthma_history"], weights["salbutamol_3y"], float(threshold),
+                 score, above)
+    return {"score": score.reshape(shape), "above_threshold": above.reshape(shape)}
+
+
+SCORERS = {
+    "ckdpc": ckdpc_risk_5y_batch,
+    "gdrs": gdrs_batch,
+    "score2": score2_risk_batch,
+    "caide": caide_batch,
+    "clivd": clivd_modellab_score_batch,
+    "plcom2012": plcom2012_risk_6y_batch,
+    "copd": copd_casefinding_score_batch,
+}
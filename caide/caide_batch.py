@@ -0,0 +1,142 @@
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+
+from ..common.batch import as_flag, as_float, category_index, weighted_sum
+
+
+def _banded_points(values: np.ndarray, bands) -> np.ndarray:
+    """
+    Points for an integer variable banded as "<47", "47–53", ">53", "≥10", "7–9", ...
+    `bands` is a list of (band text, points). Later bands win, as in the scalar
+    lookups; values matching no band get NaN.
+    """
+    points = np.full(values.shape, np.nan)
+    for text, pts in bands:
+        band = text.replace("–", "-")
+        if band.startswith("≥"):
+            hit = values >= int(band[1:])
+        elif band.startswith("≤"):
+            hit = values <= int(band[1:])
+        elif band.startswith(">"):
+            hit = values > int(band[1:])
+        elif band.startswith("<"):
+            hit = values < int(band[1:])
+        elif "-" in band:
+            lo, hi = [int(x) for x in band.split("-")]
+            hit = (values >= lo) & (values <= hi)
+        else:
+            continue
+        points = np.where(hit, float(pts), points)
+    return points
+
+
+_MODEL_KEYS = {"basic": "model_1_basic", "apoe": "model_2_apoe"}
+
+
+def _model_tables(m: Dict) -> Dict[str, object]:
+    """Point lookups and logistic constants of one CAIDE model section."""
+    variables = {v["name"]: v for v in m["variables"]}
+
+    def var(name: str) -> Dict:
+        if name not in variables:
+            raise KeyError(name)
+        return variables[name]
+
+    def categories(name: str):
+        cats = var(name)["categories"]
+        return tuple(c["code"] for c in cats), np.array([float(c.get("points", 0.0)) for c in cats])
+
+    lop = m["logistic_on_points"]
+    tables = {
+        "age_bands": tuple((c["code"], c.get("points", 0.0)) for c in var("age")["categories"]),
+        "education_bands": tuple((c.get("label") or c.get("code"), c.get("points", 0.0))
+                                 for c in var("education_years")["categories"]),
+        "sex": categories("sex"),
+        "thresholds": {
+            "sbp_over_140": float(var("sbp_over_140")["threshold"]["sbp_mmHg"]),
+            "bmi_over_30": float(var("bmi_over_30")["threshold"]["bmi"]),
+            "total_chol_over_6_5": float(var("total_chol_over_6_5")["threshold"]["chol_mmol_per_L"]),
+        },
+        "points_if_true": {
+            name: float(var(name).get("points_if_true", 0.0))
+            for name in ("sbp_over_140", "bmi_over_30", "total_chol_over_6_5", "physically_inactive")
+        },
+        "beta0": float(lop["beta0"]),
+        "beta1": float(lop.get("beta1_followup20y", 0.0)),  # 20-year follow-up
+        "beta2": float(lop["beta2_per_point"]),
+    }
+    if "apoe_status" in variables:
+        tables["apoe_status"] = categories("apoe_status")
+    return tables
+
+
+def batch_tables(bundle: Dict) -> Dict[str, object]:
+    """Bundle lookups for `caide_batch(tables=...)`, per model ("basic", "apoe") in the bundle."""
+    return {model: _model_tables(bundle[key]) for model, key in _MODEL_KEYS.items() if key in bundle}
+
+
+def caide_batch(
+    age,
+    sex,
+    education_years,
+    sbp_mmHg,
+    bmi,
+    total_chol_mmol_L,
+    physically_active,
+    apoe_status=None,
+    model: str = "basic",
+    bundle: Dict = None,
+    contributions: bool = False,
+    tables: Optional[Mapping] = None,
+):
+    """
+    Vectorized `caide`: every argument except `model` and `bundle` may be an array
+    (arrays broadcast against each other). Returns 20-year CAIDE dementia risk (%).
+
+    With `contributions`, returns {'risk_20y', 'contributions', 'terms'} instead:
+    'contributions' is (n, terms) points per bundle variable, summing to the total.
+
+    `tables` is `batch_tables(bundle)`, for callers that score one bundle many times.
+    """
+    kind = "basic" if model == "basic" else "apoe"
+    if _MODEL_KEYS[kind] not in bundle:
+        raise KeyError(f"Model {model!r} not found in bundle.")
+    t = _model_tables(bundle[_MODEL_KEYS[kind]]) if tables is None else tables[kind]
+
+    def categorical_points(name: str, codes) -> np.ndarray:
+        if name not in t:
+            raise KeyError(name)
+        cats, table = t[name]
+        return table[category_index(codes, cats, f"category for {name}")]
+
+    def binary_points(name: str, is_true) -> np.ndarray:
+        return t["points_if_true"][name] * as_flag(is_true)
+
+    # compute points per variable
+    thresholds = t["thresholds"]
+    var_points = {
+        "age": _banded_points(as_float(age), t["age_bands"]),
+        "education_years": _banded_points(as_float(education_years), t["education_bands"]),
+        "sex": categorical_points("sex", sex),
+        "sbp_over_140": binary_points("sbp_over_140", as_float(sbp_mmHg) > thresholds["sbp_over_140"]),
+        "bmi_over_30": binary_points("bmi_over_30", as_float(bmi) > thresholds["bmi_over_30"]),
+        "total_chol_over_6_5": binary_points(
+            "total_chol_over_6_5", as_float(total_chol_mmol_L) > thresholds["total_chol_over_6_5"]),
+        "physically_inactive": binary_points("physically_inactive", as_flag(physically_active) == 0),
+    }
+
+    if model == "apoe":
+        if apoe_status is None:
+            raise ValueError("apoe_status must be provided when model='apoe' (use 'non_e4' or 'e4').")
+        var_points["apoe_status"] = categorical_points("apoe_status", apoe_status)
+
+    terms = tuple(var_points)
+    points, matrix = weighted_sum(0.0, dict.fromkeys(terms, 1.0), var_points, terms, contributions)
+
+    # logistic-on-points
+    logit = t["beta0"] + t["beta1"] + t["beta2"] * points
+    p = 1.0 / (1.0 + np.exp(-logit))
+    if contributions:
+        return {"risk_20y": p * 100.0, "contributions": matrix, "terms": terms}
+    return p * 100.0
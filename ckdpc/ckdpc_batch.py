@@ -0,0 +1,278 @@
+from typing import Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
+from ..common.batch import as_flag, as_float, category_index, float_dtype, weighted_sum
+
+DM_MEDS = ("oral", "insulin", "no_meds")
+
+
+def _build_context_batch(
+    diabetes: np.ndarray,
+    age,
+    female: np.ndarray,
+    black,
+    eGFR,
+    history_cvd,
+    ever_smoker,
+    hypertensive,
+    bmi,
+    acr_mg_g=None,
+    hba1c=None,
+    dm_medication_status="oral",
+    dtype=np.float64,
+) -> Dict[str, np.ndarray]:
+    """
+    Array version of `ckdpc_core._build_context`: same feature-engineered terms, one
+    `dtype` array per term. Rows with missing (None/NaN) or non-positive ACR get a
+    zero albuminuria term, as in the scalar model.
+    """
+    age = as_float(age, dtype)
+    eGFR = as_float(eGFR, dtype)
+    bmi = as_float(bmi, dtype)
+    black = as_flag(black, dtype)
+    history_cvd = as_flag(history_cvd, dtype)
+    ever_smoker = as_flag(ever_smoker, dtype)
+    hypertensive = as_flag(hypertensive, dtype)
+
+    # Shared transforms / centered terms
+    age_centered_per5 = (age / 5.0) - 11.0
+    egfr_low_component = 15.0 - np.minimum(eGFR, 90.0) / 5.0
+    egfr_high_component = np.maximum(0.0, eGFR - 90.0) / 5.0
+    bmi_centered_per5 = (bmi / 5.0) - 5.4
+
+    expected_log10acr = (
+        0.6754442
+        + 0.0222581 * age_centered_per5
+        + 0.0459020 * female
+        - 0.0340495 * black
+        + 0.0085871 * egfr_low_component
+        - 0.0275825 * egfr_high_component
+        + 0.0495695 * history_cvd
+        + 0.0381086 * ever_smoker
+        + 0.1286836 * hypertensive
+        + 0.0218783 * bmi_centered_per5
+    )
+
+    acr = as_float(acr_mg_g, dtype)
+    has_acr = np.isfinite(acr) & (acr > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log10_acr = np.log10(np.where(has_acr, acr, 1.0))
+    # Non-diabetic model centers on expected log10(ACR); diabetic model on log10(10 mg/g) = 1.0
+    center = np.where(diabetes > 0, 1.0, expected_log10acr)
+    albuminuria_term = np.where(has_acr, log10_acr - center, 0.0)
+
+    is_diab = diabetes > 0
+    if np.any(is_diab):
+        if hba1c is None:
+            raise ValueError("For the diabetes model, 'hba1c' is required (% NGSP).")
+        if dm_medication_status is None:
+            raise ValueError("For the diabetes model, provide 'dm_medication_status' (oral|insulin|no_meds).")
+    hba1c_arr = as_float(hba1c, dtype)
+    if np.any(is_diab & ~np.isfinite(hba1c_arr)):
+        raise ValueError("For the diabetes model, 'hba1c' is required (% NGSP).")
+    meds = category_index("oral" if dm_medication_status is None else dm_medication_status,
+                          DM_MEDS, "dm_medication_status")
+
+    # Diabetes-only extra terms
+    hba1c_centered = np.where(is_diab, hba1c_arr - 7.0, 0.0)
+    insulin_indicator = diabetes * (meds == 1)
+    no_meds_indicator = diabetes * (meds == 2)
+
+    return {
+        "age_centered_per5": age_centered_per5,
+        "female": female,
+        "black": black,
+        "egfr_low_component": egfr_low_component,
+        "egfr_high_component": egfr_high_component,
+        "history_cvd": history_cvd,
+        "ever_smoker": ever_smoker,
+        "hypertensive": hypertensive,
+        "bmi_centered_per5": bmi_centered_per5,
+        "albuminuria_term": albuminuria_term,
+        "hba1c_centered": hba1c_centered,
+        "insulin_indicator": insulin_indicator,
+        "no_meds_indicator": no_meds_indicator,
+        "interaction_hba1c_insulin": hba1c_centered * insulin_indicator,
+        "interaction_hba1c_no_meds": hba1c_centered * no_meds_indicator,
+    }
+
+
+def _coefficient_tables(bundle: Dict) -> Tuple[Tuple[str, ...], np.ndarray, np.ndarray]:
+    """
+    (terms, coefficients (2, terms), intercepts (2,)), row 0 the non-diabetic and
+    row 1 the diabetic sub-model. Terms are the non-diabetic model's in bundle order,
+    then the diabetic-only ones; a term absent from a sub-model has coefficient 0.
+    """
+    models = []
+    for sub_id in ("nondiabetic", "diabetic"):
+        try:
+            models.append(bundle["models"][sub_id]["linear_predictor"])
+        except KeyError as e:
+            raise KeyError(f"Bundle missing models['{sub_id}']") from e
+
+    terms = tuple(dict.fromkeys(t["name"] for lp_def in models for t in lp_def["terms"]))
+    coefs = np.zeros((2, len(terms)))
+    for k, lp_def in enumerate(models):
+        for term in lp_def["terms"]:
+            coefs[k, terms.index(term["name"])] = float(term["coefficient"])
+    intercepts = np.array([float(lp_def["intercept"]) for lp_def in models])
+    return terms, coefs, intercepts
+
+
+def batch_tables(bundle: Dict) -> Dict[str, object]:
+    """
+    Bundle lookups for `ckdpc_risk_5y_batch(tables=...)`: terms, coefficients and
+    intercepts (`_coefficient_tables`) and the Weibull gammas, row 0 non-diabetic.
+    """
+    terms, coefs, intercepts = _coefficient_tables(bundle)
+    gammas = np.array([
+        float(bundle["models"][sub_id]["risk_model"]["gamma"]) for sub_id in ("nondiabetic", "diabetic")
+    ])
+    return {"terms": terms, "coefs": coefs, "intercepts": intercepts, "gammas": gammas}
+
+
+def _linear_predictor_batch(
+    diabetes: np.ndarray,
+    ctx: Dict[str, np.ndarray],
+    tables: Mapping,
+    contributions: bool = False,
+    dtype=np.float64,
+) -> Tuple[np.ndarray, Optional[np.ndarray], Tuple[str, ...]]:
+    """
+    Per-row linear predictor, taking intercept and coefficients from the row's
+    sub-model. Returns (lp, contribution matrix or None, term names).
+    """
+    terms = tables["terms"]
+    coefs = tables["coefs"].astype(dtype, copy=False)
+    intercepts = tables["intercepts"].astype(dtype, copy=False)
+    sub = (diabetes > 0).astype(np.intp)
+    weights = {name: coefs[sub, j] for j, name in enumerate(terms)}
+    lp, matrix = weighted_sum(intercepts[sub], weights, ctx, terms, contributions, dtype)
+    return lp, matrix, terms
+
+
+def _prepare_batch(
+    diabetes, age, sex, black, egfr, history_cvd, ever_smoker, hypertensive, bmi,
+    acr_mg_g, bundle, hba1c, dm_medication_status, contributions=False, dtype=np.float64, tables=None,
+):
+    """
+    Diabetes flags and per-row linear predictor shared by the batch entry points:
+    (diabetes, lp, contribution matrix or None, term names).
+    """
+    if bundle is None:
+        raise ValueError("'bundle' is required (pass load_ckdpc_bundle()).")
+    if tables is None:
+        tables = batch_tables(bundle)
+
+    diabetes = as_flag(diabetes, dtype)
+    female = (category_index(sex, ("male", "female"), "sex", lower=True) == 1).astype(dtype)
+    ctx = _build_context_batch(
+        diabetes=diabetes,
+        age=age,
+        female=female,
+        black=black,
+        eGFR=egfr,
+        history_cvd=history_cvd,
+        ever_smoker=ever_smoker,
+        hypertensive=hypertensive,
+        bmi=bmi,
+        acr_mg_g=acr_mg_g,
+        hba1c=hba1c,
+        dm_medication_status=dm_medication_status,
+        dtype=dtype,
+    )
+    return (diabetes,) + _linear_predictor_batch(diabetes, ctx, tables, contributions, dtype)
+
+
+def ckdpc_risk_5y_batch(
+    diabetes,
+    age,
+    sex,
+    black,
+    egfr,
+    history_cvd,
+    ever_smoker,
+    hypertensive,
+    bmi,
+    acr_mg_g=None,
+    bundle: Dict = None,
+    hba1c=None,
+    dm_medication_status="oral",
+    contributions: bool = False,
+    precision: str = "float64",
+    tables: Optional[Mapping] = None,
+):
+    """
+    Vectorized `ckdpc_risk_5y`: every argument may be an array (arrays broadcast
+    against each other, so 2-D blocks work too) and rows may mix the diabetic and
+    non-diabetic sub-models. Missing ACR is None or NaN. Returns % risk per row.
+
+    With `contributions`, returns {'risk_5y', 'contributions', 'terms'} instead:
+    'contributions' is (n, terms) coefficient * term from each row's sub-model,
+    summing to the linear predictor minus the intercept.
+
+    precision="float32" keeps inputs, terms, the linear predictor and the result in
+    float32; 5**gamma * exp(lp) and the risk transform are evaluated in float64.
+
+    `tables` is `batch_tables(bundle)`, for callers that score one bundle many times.
+    """
+    dtype = float_dtype(precision)
+    if tables is None and bundle is not None:
+        tables = batch_tables(bundle)
+    diabetes, lp, matrix, terms = _prepare_batch(
+        diabetes, age, sex, black, egfr, history_cvd, ever_smoker, hypertensive, bmi,
+        acr_mg_g, bundle, hba1c, dm_medication_status, contributions, dtype, tables,
+    )
+
+    # Weibull/Fine–Gray absolute risk at 5 years
+    gamma = tables["gammas"][(diabetes > 0).astype(np.intp)]
+    risk = 1.0 - np.exp(-(5.0 ** gamma) * np.exp(lp.astype(np.float64)))
+    risk = (np.clip(risk, 0.0, 1.0) * 100.0).astype(dtype, copy=False)
+    if contributions:
+        return {"risk_5y": risk, "contributions": matrix, "terms": terms}
+    return risk
+
+
+def ckdpc_risk_curve(
+    diabetes,
+    age,
+    sex,
+    black,
+    egfr,
+    history_cvd,
+    ever_smoker,
+    hypertensive,
+    bmi,
+    acr_mg_g=None,
+    bundle: Dict = None,
+    hba1c=None,
+    dm_medication_status="oral",
+    horizons=(1, 2, 3, 4, 5),
+) -> np.ndarray:
+    """
+    CKD-PC cumulative risk (%) of incident eGFR <60 at each of `horizons` (years).
+
+    Same inputs as `ckdpc_risk_5y_batch`. The linear predictor and exp(lp) are computed
+    once per patient; the Weibull term t**gamma is evaluated once per (sub-model,
+    horizon) and broadcast. Horizons are clamped to [0, validated horizon] (5 years in
+    the v1 bundle).
+
+    Returns an array of shape (n, len(horizons)) (input shape + (len(horizons),)).
+    """
+    diabetes, lp, _, _ = _prepare_batch(
+        diabetes, age, sex, black, egfr, history_cvd, ever_smoker, hypertensive, bmi,
+        acr_mg_g, bundle, hba1c, dm_medication_status,
+    )
+
+    sub_models = [bundle["models"]["nondiabetic"], bundle["models"]["diabetic"]]
+    validated = min(
+        float(m["risk_model"].get("horizon_years", bundle["meta"]["horizon_years"])) for m in sub_models
+    )
+    t = np.clip(np.asarray(horizons, dtype=float).reshape(-1), 0.0, validated)
+
+    # Weibull/Fine–Gray cumulative incidence: 1 - exp(-(t ** gamma) * exp(lp))
+    t_gamma = np.stack([t ** float(m["risk_model"]["gamma"]) for m in sub_models])
+    scale = t_gamma[(diabetes > 0).astype(np.intp)]
+    risk = 1.0 - np.exp(-scale * np.exp(lp)[..., None])
+    return np.clip(risk, 0.0, 1.0) * 100.0
@@ -0,0 +1,112 @@
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+
+from ..common.batch import as_flag, as_float, weighted_sum
+
+# Risk-group labels, indexed by the codes in `risk_group_15y`.
+RISK_GROUPS = ("minimal", "low", "intermediate", "high")
+
+
+def batch_tables(bundle: Dict) -> Dict[str, object]:
+    """Bundle lookups for `clivd_modellab_score_batch(tables=...)`: truncation limits and LP terms."""
+    truncation = bundle["shared_transform_helpers"]["variable_truncation"]
+    lp_def = bundle["model"]["linear_predictor"]
+    return {
+        "alcohol_max": float(truncation["alcohol_drinks_per_week"]["truncate_max"]),
+        "ggt_max": float(truncation["ggt_ul"]["truncate_max"]),
+        "terms": tuple(t["name"] for t in lp_def["terms"]),
+        "coefs": {t["name"]: float(t["coefficient"]) for t in lp_def["terms"]},
+        "intercept": float(lp_def["intercept"]),
+    }
+
+
+def _build_clivd_context_batch(
+    age,
+    female: np.ndarray,
+    whr,
+    alcohol,
+    ggt,
+    diabetes,
+    smoking_current: np.ndarray,
+    tables: Mapping,
+) -> Dict[str, np.ndarray]:
+    """Array version of `clivd_core._build_clivd_context` (truncation + spline basis)."""
+    alc = np.clip(as_float(alcohol), 0.0, tables["alcohol_max"])
+    ggt_val = np.clip(as_float(ggt), 0.0, tables["ggt_max"])
+
+    return {
+        "age": as_float(age),
+        "waist_hip_ratio_x10": as_float(whr) * 10.0,
+        "alcohol_linear": alc,
+        "alcohol_spline_s1": np.maximum(alc - 0.1, 0.0) ** 3,
+        "alcohol_spline_s2": np.maximum(alc - 1.0, 0.0) ** 3,
+        "alcohol_spline_s3": np.maximum(alc - 3.0, 0.0) ** 3,
+        "alcohol_spline_s4": np.maximum(alc - 9.0, 0.0) ** 3,
+        "alcohol_spline_s5": np.maximum(alc - 33.0, 0.0) ** 3,
+        "ggt": ggt_val,
+        "female_indicator": female,
+        "diabetes_yes": as_flag(diabetes),
+        "smoking_current": smoking_current,
+        "interaction_female_x_ggt": ggt_val * female,
+        "interaction_female_x_smoking": female * smoking_current,
+    }
+
+
+def clivd_modellab_score_batch(
+    age,
+    sex,
+    whr,
+    alcohol,
+    ggt,
+    diabetes,
+    smoking,
+    bundle: Dict = None,
+    contributions: bool = False,
+    tables: Optional[Mapping] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized `clivd_modellab_score`: every argument may be an array (arrays
+    broadcast against each other).
+
+    Returns:
+      {
+        'linear_predictor': array,
+        'hazard_ratio': array,
+        'risk_group_15y': int8 array of indices into RISK_GROUPS,
+        'contributions': (n, terms) coefficient * term, summing to LP - intercept  # with `contributions`
+        'terms': term names, in bundle order                                        # with `contributions`
+      }
+
+    `tables` is `batch_tables(bundle)`, for callers that score one bundle many times.
+    """
+    if bundle is None:
+        raise ValueError("'bundle' is required (pass load_clivd_bundle()).")
+    if tables is None:
+        tables = batch_tables(bundle)
+
+    female = (np.asarray(sex) == "female").astype(float)
+    smoking_current = (np.asarray(smoking) == "current").astype(float)
+    ctx = _build_clivd_context_batch(
+        age=age, female=female, whr=whr, alcohol=alcohol,
+        ggt=ggt, diabetes=diabetes, smoking_current=smoking_current,
+        tables=tables,
+    )
+
+    # Linear predictor
+    terms = tables["terms"]
+    lp, matrix = weighted_sum(tables["intercept"], tables["coefs"], ctx, terms, contributions)
+
+    # Risk-group classification from supplement cut points (minimal < -0.258 <= low
+    # <= 2.066 < intermediate <= 2.784 < high)
+    group = (lp >= -0.258).astype(np.int8) + (lp > 2.066) + (lp > 2.784)
+
+    out = {
+        "linear_predictor": lp,
+        "hazard_ratio": np.exp(lp),
+        "risk_group_15y": group.astype(np.int8),
+    }
+    if contributions:
+        out["contributions"] = matrix
+        out["terms"] = terms
+    return out
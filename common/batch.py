@@ -0,0 +1,130 @@
+from typing import List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def group_codes(
+    groups: Optional[Mapping[str, object]],
+    n: int,
+) -> Tuple[np.ndarray, List[Tuple]]:
+    """
+    Encode one or more subgroup columns into a single dense integer code per row.
+
+    groups: mapping of column name -> array-like of length n (e.g. region, sex,
+            diabetes). None or {} puts every row in one group.
+
+    Returns (codes, keys) where codes[i] indexes keys, and keys[k] is the tuple of
+    original values (in the mapping's order) for group k. Keys are sorted.
+    """
+    if not groups:
+        return np.zeros(n, dtype=np.int64), [()]
+
+    levels = []
+    combined = np.zeros(n, dtype=np.int64)
+    for name, values in groups.items():
+        arr = np.asarray(values)
+        if arr.shape != (n,):
+            raise ValueError(f"Group column {name!r} has shape {arr.shape}, expected ({n},).")
+        uniq, inv = np.unique(arr, return_inverse=True)
+        combined = combined * len(uniq) + inv.reshape(-1)
+        levels.append(uniq)
+
+    used, codes = np.unique(combined, return_inverse=True)
+    keys: List[Tuple] = []
+    for c in used.tolist():
+        parts = []
+        for uniq in reversed(levels):
+            c, idx = divmod(c, len(uniq))
+            parts.append(uniq[idx].item())
+        keys.append(tuple(reversed(parts)))
+    return codes.reshape(-1).astype(np.int64), keys
+
+
+
+# Storage precisions accepted by the batch scorers' `precision` option.
+PRECISIONS = {"float64": np.float64, "float32": np.float32}
+
+
+def float_dtype(precision: str = "float64") -> type:
+    """NumPy float type for a `precision` option ("float64" or "float32")."""
+    try:
+        return PRECISIONS[precision]
+    except KeyError as e:
+        raise ValueError(f"Unknown precision {precision!r}. Allowed: {list(PRECISIONS)}") from e
+
+
+def as_float(values, dtype=np.float64) -> np.ndarray:
+    """Numeric input column as a float array (float64 unless `dtype`); None becomes NaN (missing)."""
+    if values is None:
+        return np.asarray(np.nan, dtype=dtype)
+    arr = np.asarray(values)
+    if arr.dtype == object:
+        arr = np.where(np.equal(arr, None), np.nan, arr)
+    return arr.astype(dtype)
+
+
+def as_flag(values, dtype=np.float64) -> np.ndarray:
+    """Binary input column as a 0.0/1.0 float array."""
+    return np.asarray(values).astype(bool).astype(dtype)
+
+
+def category_index(
+    values,
+    categories: Sequence[str],
+    name: str,
+    lower: bool = False,
+) -> np.ndarray:
+    """
+    Map a categorical input column onto indices into `categories`.
+
+    Values are compared as strings (so 0/1 counts match "0"/"1"); only the distinct
+    values are looked up, so the cost is one np.unique over the column.
+    """
+    arr = np.asarray(values)
+    uniq, inv = np.unique(arr, return_inverse=True)
+    lookup = {c: i for i, c in enumerate(categories)}
+    idx = np.empty(len(uniq), dtype=np.int64)
+    for k, u in enumerate(uniq.tolist()):
+        key = str(u).lower() if lower else str(u)
+        if key not in lookup:
+            raise ValueError(f"Unknown {name} {u!r}. Allowed: {list(categories)}")
+        idx[k] = lookup[key]
+    return idx[inv.reshape(arr.shape)]
+
+
+def weighted_sum(
+    intercept,
+    weights: Mapping[str, object],
+    values: Mapping[str, np.ndarray],
+    names: Sequence[str],
+    contributions: bool = False,
+    dtype=np.float64,
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    intercept + sum(weights[name] * values[name] for name in names), accumulated in
+    the order of `names` (linear predictors, points totals).
+
+    Weights may be scalars or per-row arrays. With `contributions`, the individual
+    products are also written into one (..., len(names)) matrix, column j for
+    names[j]; otherwise the matrix is None. Either way each product is computed once.
+    The total and matrix are `dtype` arrays (pass float32 weights and values to
+    accumulate in float32).
+    """
+    for name in names:
+        if name not in values:
+            raise KeyError(f"Context missing term '{name}'.")
+
+    matrix = None
+    if contributions:
+        shape = np.broadcast_shapes(
+            np.shape(intercept), *(np.shape(weights[n]) for n in names), *(np.shape(values[n]) for n in names)
+        )
+        matrix = np.empty(shape + (len(names),), dtype=dtype)
+
+    total = intercept
+    for j, name in enumerate(names):
+        term = weights[name] * values[name]
+        if matrix is not None:
+            matrix[..., j] = term
+        total = total + term
+    return np.asarray(total, dtype=dtype), matrix
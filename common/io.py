@@ -1,6 +1,7 @@
+import hashlib
 import json
 import importlib.resources as res
-from typing import Dict
+from typing import Dict, Mapping
 
 def load_bundle(package_subpath: str, filename: str) -> Dict:
     """
@@ -10,3 +11,23 @@ def load_bundle(package_subpath: str, filename: str) -> Dict:
     """
     with res.files(package_subpath).joinpath(filename).open("r", encoding="utf-8") as f:
         return json.load(f)
+
+def load_bundle_file(path: str) -> Dict:
+    """Load a JSON bundle from a filesystem path (e.g. a recalibrated bundle on shared storage)."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def bundle_sha256(bundle: Dict) -> str:
+    """
+    Content hash of a loaded bundle: SHA-256 of its canonical JSON (sorted keys, no
+    whitespace), so formatting changes to the file do not change the hash. Frozen
+    bundles (read-only mappings, tuples) hash like the JSON they were loaded from.
+    """
+    canonical = json.dumps(bundle, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=_plain)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def _plain(obj):
+    """json.dumps fallback: read-only mappings (MappingProxyType) serialize as dicts."""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,161 @@
+import inspect
+from typing import Dict, Mapping
+
+import numpy as np
+
+from ..caide.caide_batch import batch_tables as caide_tables, caide_batch
+from ..caide.caide_core import load_caide_bundle
+from ..ckdpc.ckdpc_batch import batch_tables as ckdpc_tables, ckdpc_risk_5y_batch
+from ..ckdpc.ckdpc_core import load_ckdpc_bundle
+from ..clivd.clivd_batch import RISK_GROUPS, batch_tables as clivd_tables, clivd_modellab_score_batch
+from ..clivd.clivd_core import load_clivd_bundle
+from ..copd.copd_batch import batch_tables as copd_tables, copd_casefinding_score_batch
+from ..copd.copd_core import load_copd_bundle
+from ..gdrs.gdrs_batch import batch_tables as gdrs_tables, gdrs_batch
+from ..gdrs.gdrs_core import load_gdrs_bundle
+from ..plcom2012.plcom2012_batch import batch_tables as plcom2012_tables, plcom2012_risk_6y_batch
+from ..plcom2012.plcom2012_core import load_plcom2012_bundle
+from ..score2.score2_batch import batch_tables as score2_tables, score2_risk_batch
+from ..score2.score2_core import load_score2_bundle
+
+# Batch scorers by model name.
+#   load_bundle: loader for the packaged bundle (takes an optional filename)
+#   scorer:      vectorized calculator
+#   prepare:     bundle -> lookup tables for the scorer's `tables` argument (built once
+#                per bundle by serving.CompiledModel)
+#   outputs:     result columns, in order (single-array scorers return the first)
+#   summaries:   default RiskAggregator metric specs for the outputs worth summarizing
+#   example:     small valid input (canary rows used to validate a bundle before use)
+#   flags:       binary arguments (read with as_flag; a missing flag counts as 0, as in
+#                the scalar calculators)
+#   nullable:    numeric arguments where NaN means "not measured" and is handled by
+#                the scorer
+#   categories:  categorical arguments (matched as strings against the bundle's codes,
+#                so 0/1 count as "0"/"1")
+MODELS: Dict[str, Dict] = {
+    "ckdpc": {
+        "load_bundle": load_ckdpc_bundle,
+        "scorer": ckdpc_risk_5y_batch,
+        "prepare": ckdpc_tables,
+        "outputs": ("risk_5y",),
+        "summaries": {"risk_5y": {}},
+        "example": {"diabetes": [0, 1], "age": [60, 60], "sex": ["female", "male"], "black": [0, 1], "egfr": [80, 95],
+                    "history_cvd": [0, 1], "ever_smoker": [1, 0], "hypertensive": [1, 1], "bmi": [28, 31],
+                    "acr_mg_g": [15, 40], "hba1c": [7.5, 7.5]},
+        "flags": ("diabetes", "black", "history_cvd", "ever_smoker", "hypertensive"),
+        "nullable": ("acr_mg_g", "hba1c"),
+        "categories": ("sex", "dm_medication_status"),
+    },
+    "gdrs": {
+        "load_bundle": load_gdrs_bundle,
+        "scorer": gdrs_batch,
+        "prepare": gdrs_tables,
+        "outputs": ("risk_5y",),
+        "summaries": {"risk_5y": {}},
+        "example": {"age": [50], "height": [170], "waist": [90], "hypertension": [0], "exercise": [2],
+                    "smoking": ["never"], "wholegrains": [2], "coffee": [2], "redmeat": [1],
+                    "diabetes_one_parent": [0], "diabetes_both_parents": [0], "diabetes_sibling": [0],
+                    "hba1c": [5.5]},
+        "flags": ("hypertension", "diabetes_one_parent", "diabetes_both_parents", "diabetes_sibling"),
+        "nullable": (),
+        "categories": ("smoking",),
+    },
+    "score2": {
+        "load_bundle": load_score2_bundle,
+        "scorer": score2_risk_batch,
+        "prepare": score2_tables,
+        "outputs": ("risk_10y",),
+        "summaries": {"risk_10y": {}},
+        "example": {"age": [55], "sex": ["male"], "smoker": [1], "sbp": [140], "tchol": [5.5], "hdl": [1.3],
+                    "region": ["moderate"]},
+        "flags": ("smoker",),
+        "nullable": (),
+        "categories": ("sex", "region"),
+    },
+    "caide": {
+        "load_bundle": load_caide_bundle,
+        "scorer": caide_batch,
+        "prepare": caide_tables,
+        "outputs": ("risk_20y",),
+        "summaries": {"risk_20y": {}},
+        "example": {"age": [50], "sex": ["male"], "education_years": [8], "sbp_mmHg": [145], "bmi": [27],
+                    "total_chol_mmol_L": [6.0], "physically_active": [1]},
+        "flags": ("physically_active",),
+        "nullable": (),
+        "categories": ("sex", "apoe_status"),
+    },
+    "clivd": {
+        "load_bundle": load_clivd_bundle,
+        "scorer": clivd_modellab_score_batch,
+        "prepare": clivd_tables,
+        "outputs": ("linear_predictor", "hazard_ratio", "risk_group_15y"),
+        "summaries": {"linear_predictor": {}, "risk_group_15y": {"categories": len(RISK_GROUPS)}},
+        "example": {"age": [55], "sex": ["male"], "whr": [0.95], "alcohol": [10], "ggt": [40], "diabetes": [0],
+                    "smoking": ["current"]},
+        "flags": ("diabetes",),
+        "nullable": (),
+        "categories": ("sex", "smoking"),
+    },
+    "plcom2012": {
+        "load_bundle": load_plcom2012_bundle,
+        "scorer": plcom2012_risk_6y_batch,
+        "prepare": plcom2012_tables,
+        "outputs": ("risk_6y", "prob_6y", "linear_predictor"),
+        "summaries": {"risk_6y": {}},
+        "example": {"age_years": [65], "race": ["white"], "education_level": [4], "bmi": [27], "copd": [0],
+                    "personal_history_cancer": [0], "family_history_lung_cancer": [1],
+                    "smoking_status": ["current"], "smoking_intensity_cigs_per_day": [20],
+                    "smoking_duration_years": [40], "quit_time_years": [0]},
+        "flags": ("copd", "personal_history_cancer", "family_history_lung_cancer"),
+        "nullable": ("quit_time_years",),
+        "categories": ("race", "smoking_status"),
+    },
+    "copd": {
+        "load_bundle": load_copd_bundle,
+        "scorer": copd_casefinding_score_batch,
+        "prepare": copd_tables,
+        "outputs": ("score", "above_threshold"),
+        "summaries": {"score": {}, "above_threshold": {"categories": 2}},
+        "example": {"smoking_status": ["current"], "asthma_history": [0], "lrti_count_3y": ["1"], "salbutamol_3y": [0]},
+        "flags": ("asthma_history", "salbutamol_3y"),
+        "nullable": (),
+        "categories": ("smoking_status", "lrti_count_3y"),
+    },
+}
+
+
+def get_model(name: str) -> Dict:
+    try:
+        return MODELS[name]
+    except KeyError as e:
+        raise KeyError(f"Unknown model {name!r}. Available: {sorted(MODELS)}") from e
+
+
+def input_names(name: str):
+    """Scorer argument names a model reads from the input columns (bundle/options excluded)."""
+    params = inspect.signature(get_model(name)["scorer"]).parameters
+    return tuple(p for p in params if p not in ("bundle", "model", "threshold", "contributions", "precision", "tables"))
+
+
+def score_model(
+    name: str,
+    inputs: Mapping[str, object],
+    bundle: Dict,
+    **options,
+) -> Dict[str, np.ndarray]:
+    """
+    Score one model from a mapping of input columns (extra columns are ignored).
+
+    Returns {output name: array} with the columns listed in MODELS[name]["outputs"],
+    plus 'contributions' and 'terms' when called with contributions=True.
+    """
+    spec = get_model(name)
+    columns = {k: inputs[k] for k in input_names(name) if k in inputs}
+    result = spec["scorer"](**columns, bundle=bundle, **options)
+    if not isinstance(result, dict):
+        result = {spec["outputs"][0]: result}
+    out = {k: np.asarray(result[k]) for k in spec["outputs"]}
+    if "contributions" in result:
+        out["contributions"] = result["contributions"]
+        out["terms"] = result["terms"]
+    return out
@@ -0,0 +1,73 @@
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+
+from ..common.batch import as_flag, category_index, weighted_sum
+
+
+def batch_tables(bundle: Dict) -> Dict[str, object]:
+    """Bundle lookups for `copd_casefinding_score_batch(tables=...)`: category points and flag weights."""
+    coeffs = bundle["score_model"]["coefficients"]
+    smoking_codes = tuple(coeffs["smoking_status"])
+    lrti_codes = tuple(coeffs["lrti_count_3y"])
+    return {
+        "smoking_codes": smoking_codes,
+        "smoking_points": np.array([float(coeffs["smoking_status"][c]) for c in smoking_codes]),
+        "lrti_codes": lrti_codes,
+        "lrti_points": np.array([float(coeffs["lrti_count_3y"][c]) for c in lrti_codes]),
+        "weights": {
+            "smoking_status": 1.0,
+            "asthma_history": float(coeffs["asthma_history"]),
+            "lrti_count_3y": 1.0,
+            "salbutamol_3y": float(coeffs["salbutamol_3y"]),
+        },
+    }
+
+
+def copd_casefinding_score_batch(
+    smoking_status,
+    asthma_history,
+    lrti_count_3y,
+    salbutamol_3y,
+    bundle: Dict,
+    threshold: float = 2.5,
+    contributions: bool = False,
+    tables: Optional[Mapping] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized Haroon COPD case-finding score: every input may be an array (arrays
+    broadcast against each other).
+
+    Returns:
+      {
+        'score': array,             # linear score
+        'above_threshold': bool array (score >= threshold),
+        'contributions': (n, 4) score points per input, summing to 'score'  # with `contributions`
+        'terms': input names, in argument order                             # with `contributions`
+      }
+
+    `tables` is `batch_tables(bundle)`, for callers that score one bundle many times.
+    """
+    if tables is None:
+        tables = batch_tables(bundle)
+    smoking_codes, smoking_table = tables["smoking_codes"], tables["smoking_points"]
+    lrti_codes, lrti_table = tables["lrti_codes"], tables["lrti_points"]
+
+    points = {
+        "smoking_status": smoking_table[category_index(smoking_status, smoking_codes, "smoking_status", lower=True)],
+        "asthma_history": as_flag(asthma_history),
+        "lrti_count_3y": lrti_table[category_index(lrti_count_3y, lrti_codes, "lrti_count_3y")],
+        "salbutamol_3y": as_flag(salbutamol_3y),
+    }
+    terms = tuple(points)
+    weights = tables["weights"]
+    score, matrix = weighted_sum(0.0, weights, points, terms, contributions)
+
+    out = {
+        "score": score,
+        "above_threshold": score >= threshold,
+    }
+    if contributions:
+        out["contributions"] = matrix
+        out["terms"] = terms
+    return out
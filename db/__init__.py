@@ -0,0 +1,3 @@
+from .db_core import check_integer_categories, insert_columns, score_table, table_columns
+
+__all__ = ["check_integer_categories", "insert_columns", "score_table", "table_columns"]
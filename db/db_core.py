@@ -0,0 +1,289 @@
+import sqlite3
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..backends.backends_core import _max_abs_diff, sample_inputs, score as backend_score
+from ..common.models import get_model, input_names
+
+ModelEntry = Union[str, Dict]
+
+CHUNK_ROWS = 50_000
+COMMIT_ROWS = 500_000
+
+
+def _quote(identifier: str) -> str:
+    """SQL identifier in double quotes (embedded quotes doubled)."""
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def _connect(db: Union[str, sqlite3.Connection]) -> Tuple[sqlite3.Connection, bool]:
+    if isinstance(db, sqlite3.Connection):
+        return db, False
+    return sqlite3.connect(db), True
+
+
+def table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    """Column names of `table` (empty if it does not exist)."""
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({_quote(table)})")]
+
+
+def _sql_type(arr: np.ndarray) -> str:
+    kind = arr.dtype.kind
+    if kind in "biu":
+        return "INTEGER"
+    if kind == "f":
+        return "REAL"
+    return "TEXT"
+
+
+def insert_columns(
+    db: Union[str, sqlite3.Connection],
+    table: str,
+    columns: Mapping[str, object],
+    chunk_rows: int = CHUNK_ROWS,
+) -> int:
+    """
+    Append equal-length arrays to `table` as rows (creating the table, typed from the
+    arrays, if needed). Handy for loading a test cohort into a local SQLite file.
+    Returns the number of rows inserted.
+    """
+    conn, owned = _connect(db)
+    try:
+        arrays = {k: np.asarray(v) for k, v in columns.items()}
+        names = list(arrays)
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {_quote(table)} ("
+            + ", ".join(f"{_quote(k)} {_sql_type(a)}" for k, a in arrays.items()) + ")"
+        )
+        sql = (f"INSERT INTO {_quote(table)} ({', '.join(map(_quote, names))}) "
+               f"VALUES ({', '.join('?' * len(names))})")
+        n = len(next(iter(arrays.values()))) if arrays else 0
+        with conn:
+            for lo in range(0, n, chunk_rows):
+                conn.executemany(sql, zip(*(arrays[k][lo:lo + chunk_rows].tolist() for k in names)))
+        return n
+    finally:
+        if owned:
+            conn.close()
+
+
+def _column_array(values: Sequence, categorical: bool = False) -> np.ndarray:
+    """
+    One fetched column as an array. Categorical columns become strings, with whole
+    numbers written as integers (an INTEGER 1 or REAL 1.0 reads as "1"), and object
+    dtype if they hold NULLs; all other columns become float with NULL -> NaN. The
+    type follows the argument, not the values, so it is the same in every chunk.
+    """
+    if categorical:
+        codes = [v if v is None or isinstance(v, str) else
+                 str(int(v)) if float(v).is_integer() else str(v) for v in values]
+        return np.array(codes, dtype=object if None in codes else str)
+    return np.array(values, dtype=float)
+
+
+def _chunk_inputs(
+    p: Dict, data: Mapping[str, Sequence], keys: Sequence, arrays: Dict[Tuple[str, bool], np.ndarray],
+) -> Dict[str, np.ndarray]:
+    """
+    Scorer inputs of one plan entry for a chunk of fetched `data` ({column: values}).
+    Columns are converted on first use and kept in `arrays`, shared by the models of
+    the chunk. A NULL flag counts as 0 (as in the scalar calculators) and a NULL in a
+    nullable numeric argument stays NaN (missing); NULL anywhere else raises
+    ValueError naming the column and first key.
+    """
+    inputs = {}
+    for arg, col in p["inputs"].items():
+        kind = (col, arg in p["categories"])
+        if kind not in arrays:
+            arrays[kind] = _column_array(data[col], kind[1])
+        arr = arrays[kind]
+        if arr.dtype == object:
+            null = np.equal(arr, None)
+        elif arr.dtype.kind == "f":
+            null = np.isnan(arr)
+        else:
+            null = None
+        if null is not None and null.any():
+            if arg in p["flags"]:
+                arr = np.where(null, 0, arr)
+            elif not (arg in p["nullable"] and arr.dtype.kind == "f"):
+                raise ValueError(f"column {col!r} ({arg}) is NULL, first at key {keys[int(np.argmax(null))]!r}")
+        inputs[arg] = arr
+    return inputs
+
+
+def _plan(
+    models: Iterable[ModelEntry],
+    columns: Optional[Mapping[str, str]],
+    available: Sequence[str],
+) -> List[Dict]:
+    """Per model: bundle, its tables, options, and {scorer argument: table column} for the columns that exist."""
+    plan = []
+    for m in models:
+        entry = {"name": m} if isinstance(m, str) else dict(m)
+        name = entry["name"]
+        spec = get_model(name)
+        mapping = {**(columns or {}), **entry.get("columns", {})}
+        inputs = {}
+        for arg in input_names(name):
+            col = mapping.get(arg, arg)
+            if col in available:
+                inputs[arg] = col
+            elif arg in mapping:
+                raise KeyError(f"Column {col!r} mapped to {name}.{arg} is not in the table.")
+        bundle = entry.get("bundle")
+        if not isinstance(bundle, Mapping):
+            bundle = spec["load_bundle"](bundle) if bundle else spec["load_bundle"]()
+        plan.append({
+            "name": name,
+            "bundle": bundle,
+            "tables": spec["prepare"](bundle),
+            "options": entry.get("options", {}),
+            "inputs": inputs,
+            "outputs": spec["outputs"],
+            "flags": spec.get("flags", ()),
+            "nullable": spec.get("nullable", ()),
+            "categories": spec.get("categories", ()),
+        })
+    return plan
+
+
+def score_table(
+    db: Union[str, sqlite3.Connection],
+    table: str,
+    models: Iterable[ModelEntry],
+    columns: Optional[Mapping[str, str]] = None,
+    key: str = "rowid",
+    results_table: str = "risk_results",
+    where: Optional[str] = None,
+    chunk_rows: int = CHUNK_ROWS,
+    commit_rows: int = COMMIT_ROWS,
+    resume: bool = True,
+) -> Dict[str, object]:
+    """
+    Score the rows of `table` with the batch scorers and write the results to
+    `results_table`.
+
+    models:    model names ("score2") or dicts {"name", "bundle", "options",
+               "columns"}; "bundle" is a bundle dict or a packaged filename
+    columns:   {scorer argument: table column}, e.g. {"age": "age_years",
+               "sbp": "systolic_bp"}; arguments not listed read the column of the
+               same name, and arguments with no column use the scorer's default
+    key:       unique, ordered key column of `table` (default the SQLite rowid)
+    where:     optional SQL filter on `table` (e.g. "age BETWEEN 40 AND 69")
+    resume:    continue after the largest key already in `results_table`
+
+    Rows are read in key order, `chunk_rows` at a time (keyset pagination: each chunk
+    is `WHERE key > last ORDER BY key LIMIT chunk_rows`, so no cursor is held open
+    across commits), converted to column arrays once per chunk and scored on the
+    vectorized path. Categorical inputs (`MODELS[name]["categories"]`) are read as
+    strings and whole numbers as integers, so a category stored as INTEGER (0/1)
+    matches the codes "0"/"1"; every other input is read as float. Results go to `results_table` (key plus one column
+    "<model>_<output>" per output) with `executemany`, committed every
+    `commit_rows` rows. A chunk that fails validation raises ValueError naming its
+    key range; everything committed before it stays.
+
+    SQL NULL: a NULL flag (e.g. smoker) counts as 0, as in the scalar calculators; a
+    NULL in a model's nullable inputs (CKD-PC ACR and HbA1c, PLCOm2012 quit time) is
+    missing (NaN); a NULL in any other input fails the chunk.
+
+    Returns {'rows': rows scored by this call, 'chunks', 'results_table', 'columns'}.
+    """
+    conn, owned = _connect(db)
+    try:
+        available = table_columns(conn, table)
+        if not available:
+            raise KeyError(f"Table {table!r} not found.")
+        plan = _plan(models, columns, available)
+
+        read_cols = list(dict.fromkeys(col for p in plan for col in p["inputs"].values()))
+        out_cols = [f"{p['name']}_{out}" for p in plan for out in p["outputs"]]
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {_quote(results_table)} ({_quote(key)} PRIMARY KEY, "
+            + ", ".join(_quote(c) for c in out_cols) + ")"
+        )
+        missing = set(out_cols) - set(table_columns(conn, results_table))
+        if missing:
+            raise ValueError(f"Results table {results_table!r} lacks column(s) {sorted(missing)}.")
+
+        last = None
+        if resume:
+            last = conn.execute(f"SELECT MAX({_quote(key)}) FROM {_quote(results_table)}").fetchone()[0]
+
+        head = f"SELECT {', '.join(map(_quote, [key] + read_cols))} FROM {_quote(table)}"
+        filters = [f"({where})"] if where else []
+        tail = f"ORDER BY {_quote(key)} LIMIT ?"
+        first = " ".join([head] + (["WHERE " + filters[0]] if filters else []) + [tail])
+        select = " ".join([head, "WHERE " + " AND ".join([f"{_quote(key)} > ?"] + filters), tail])
+        insert = (f"INSERT OR REPLACE INTO {_quote(results_table)} ({_quote(key)}, "
+                  f"{', '.join(map(_quote, out_cols))}) VALUES ({', '.join('?' * (len(out_cols) + 1))})")
+
+        rows = chunks = pending = 0
+        while True:
+            if last is None:
+                fetched = conn.execute(first, (chunk_rows,)).fetchall()
+            else:
+                fetched = conn.execute(select, (last, chunk_rows)).fetchall()
+            if not fetched:
+                break
+            keys, *values = zip(*fetched)
+            data = dict(zip(read_cols, values))
+            arrays: Dict[Tuple[str, bool], np.ndarray] = {}
+
+            results = []
+            for p in plan:
+                try:
+                    out = backend_score(p["name"], _chunk_inputs(p, data, keys, arrays), p["bundle"],
+                                        tables=p["tables"], **p["options"])
+                except (KeyError, TypeError, ValueError) as e:
+                    conn.commit()
+                    raise ValueError(
+                        f"{p['name']} failed on {key} {keys[0]!r}..{keys[-1]!r} of {table!r}: {e}"
+                    ) from e
+                results.extend(np.asarray(out[o]).reshape(-1).tolist() for o in p["outputs"])
+
+            conn.executemany(insert, zip(keys, *results))
+            last = keys[-1]
+            rows += len(keys)
+            chunks += 1
+            pending += len(keys)
+            if pending >= commit_rows:
+                conn.commit()
+                pending = 0
+        conn.commit()
+        return {"rows": rows, "chunks": chunks, "results_table": results_table, "columns": out_cols}
+    finally:
+        if owned:
+            conn.close()
+
+
+def check_integer_categories(n: int = 2000, chunk_rows: int = 256, seed: int = 0) -> Dict[str, float]:
+    """
+    Score a COPD cohort from an in-memory SQLite table whose `lrti_count_3y` column
+    is INTEGER: 0 and 1 stored as integers, ">1" as text, sorted so the first chunks
+    hold integers only. Compares every output with in-memory scoring of the string
+    codes and returns {output: max absolute difference} (0.0 when they agree).
+    """
+    inputs = sample_inputs("copd", n, seed)
+    order = np.argsort(inputs["lrti_count_3y"] == ">1", kind="stable")
+    inputs = {k: v[order] for k, v in inputs.items()}
+    lrti = [int(c) if c.isdigit() else c for c in inputs["lrti_count_3y"].tolist()]
+
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute('CREATE TABLE cohort (smoking_status TEXT, asthma_history INTEGER, '
+                     'lrti_count_3y INTEGER, salbutamol_3y INTEGER)')
+        conn.executemany("INSERT INTO cohort VALUES (?, ?, ?, ?)", zip(
+            inputs["smoking_status"].tolist(), inputs["asthma_history"].astype(int).tolist(), lrti,
+            inputs["salbutamol_3y"].astype(int).tolist(),
+        ))
+        score_table(conn, "cohort", ["copd"], results_table="results", chunk_rows=chunk_rows)
+        outputs = get_model("copd")["outputs"]
+        got = np.array(conn.execute(
+            f"SELECT {', '.join(f'copd_{o}' for o in outputs)} FROM results ORDER BY rowid"
+        ).fetchall(), dtype=float)
+    finally:
+        conn.close()
+    want = backend_score("copd", inputs, get_model("copd")["load_bundle"](), backend="numpy")
+    return {o: _max_abs_diff(got[:, j], np.asarray(want[o])) for j, o in enumerate(outputs)}
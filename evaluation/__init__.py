@@ -0,0 +1,4 @@
+from .bootstrap import bootstrap_ci
+from .evaluation_core import c_statistic, evaluate_performance
+
+__all__ = ["bootstrap_ci", "c_statistic", "evaluate_performance"]
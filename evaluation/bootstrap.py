@@ -0,0 +1,226 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from statistics import NormalDist
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+# Replicates per pool task. Fixed (not derived from the worker count) so that a given
+# seed yields the same replicates however many workers run them.
+_BLOCK = 25
+
+# Per-process views of the shared cohort arrays, set by `_attach`.
+_SHARED: Dict[str, np.ndarray] = {}
+_HANDLES = []
+
+
+def _prepare(risk: np.ndarray, outcome: Optional[np.ndarray], thresholds: Sequence[float]):
+    """Sort the cohort by risk once; every replicate is then a reweighting of these rows."""
+    order = np.argsort(risk, kind="stable")
+    r = np.ascontiguousarray(risk[order])
+    arrays = {
+        "risk": r,
+        # rows at or beyond cut[k] have risk >= thresholds[k]
+        "cut": np.searchsorted(r, np.asarray(thresholds, dtype=float), side="left").astype(np.int64),
+    }
+    if outcome is not None:
+        new_run = np.ones(r.size, dtype=bool)
+        new_run[1:] = r[1:] != r[:-1]
+        arrays["outcome"] = np.ascontiguousarray(outcome[order])
+        arrays["run_start"] = np.flatnonzero(new_run)
+    return arrays
+
+
+def _statistics(arrays: Dict[str, np.ndarray], w: np.ndarray) -> np.ndarray:
+    """[mean risk, proportion above each threshold..., C-statistic] under row weights w."""
+    r = arrays["risk"]
+    head = np.concatenate([[0.0], np.cumsum(w)])
+    total = head[-1]
+    out = [np.dot(w, r) / total]
+    out.extend((total - head[arrays["cut"]]) / total)
+
+    if "outcome" in arrays:
+        y = arrays["outcome"]
+        starts = arrays["run_start"]
+        case = np.add.reduceat(w * y, starts)
+        ctrl = np.add.reduceat(w * (1.0 - y), starts)
+        below = np.cumsum(ctrl) - ctrl
+        denom = case.sum() * ctrl.sum()
+        out.append(np.dot(case, below + 0.5 * ctrl) / denom if denom > 0 else np.nan)
+    return np.asarray(out, dtype=float)
+
+
+def _replicates(arrays: Dict[str, np.ndarray], seed: np.random.SeedSequence, count: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    n = arrays["risk"].size
+    out = []
+    for _ in range(count):
+        w = np.bincount(rng.integers(0, n, size=n), minlength=n).astype(float)
+        out.append(_statistics(arrays, w))
+    return np.asarray(out)
+
+
+def _attach(specs: Dict[str, tuple]) -> None:
+    """Pool initializer: map the parent's shared-memory blocks as read-only arrays."""
+    for name, (shm_name, shape, dtype) in specs.items():
+        try:
+            shm = shared_memory.SharedMemory(name=shm_name, track=False)
+        except TypeError:  # Python < 3.13 has no `track`; the parent owns the block anyway
+            shm = shared_memory.SharedMemory(name=shm_name)
+        arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        arr.flags.writeable = False
+        _HANDLES.append(shm)
+        _SHARED[name] = arr
+
+
+def _worker(seed: np.random.SeedSequence, count: int) -> np.ndarray:
+    return _replicates(_SHARED, seed, count)
+
+
+def _jackknife(arrays: Dict[str, np.ndarray], estimate: np.ndarray) -> Sequence[np.ndarray]:
+    """Closed-form leave-one-out values of every statistic (no refitting)."""
+    r = arrays["risk"]
+    n = r.size
+    jack = [(r.sum() - r) / (n - 1)]
+    idx = np.arange(n)
+    for k in arrays["cut"]:
+        above = (idx >= k).astype(float)
+        jack.append((above.sum() - above) / (n - 1))
+
+    if "outcome" in arrays:
+        y = arrays["outcome"]
+        starts = arrays["run_start"]
+        run = np.repeat(np.arange(starts.size), np.diff(np.append(starts, n)))
+        case = np.add.reduceat(y, starts)
+        ctrl = np.add.reduceat(1.0 - y, starts)
+        n1, n0 = case.sum(), ctrl.sum()
+        ctrl_below = (np.cumsum(ctrl) - ctrl)[run]
+        case_above = (n1 - np.cumsum(case))[run]
+        # placement values: share of the other class each row out-ranks (ties 1/2)
+        auc = estimate[-1]
+        if n1 > 1 and n0 > 1:
+            v_case = (ctrl_below + 0.5 * ctrl[run]) / n0
+            v_ctrl = (case_above + 0.5 * case[run]) / n1
+            jack.append(np.where(y > 0, (n1 * auc - v_case) / (n1 - 1), (n0 * auc - v_ctrl) / (n0 - 1)))
+        else:
+            jack.append(np.full(n, np.nan))
+    return jack
+
+
+def _interval(reps: np.ndarray, estimate: float, jack: Optional[np.ndarray], level: float, method: str):
+    reps = reps[np.isfinite(reps)]
+    if reps.size == 0 or not math.isfinite(estimate):
+        return float("nan"), float("nan")
+    alpha = (1.0 - level) / 2.0
+    probs = np.array([alpha, 1.0 - alpha])
+
+    if method == "bca":
+        nd = NormalDist()
+        share = (np.sum(reps < estimate) + 0.5 * np.sum(reps == estimate)) / reps.size
+        share = min(max(share, 1.0 / (reps.size + 1)), reps.size / (reps.size + 1))
+        z0 = nd.inv_cdf(share)
+        d = jack.mean() - jack
+        ss = np.sum(d ** 2)
+        a = np.sum(d ** 3) / (6.0 * ss ** 1.5) if ss > 0 else 0.0
+        z = np.array([nd.inv_cdf(p) for p in probs])
+        adj = z0 + (z0 + z) / (1.0 - a * (z0 + z))
+        probs = np.array([nd.cdf(v) for v in adj])
+
+    lo, hi = np.quantile(reps, probs)
+    return float(lo), float(hi)
+
+
+def bootstrap_ci(
+    risk,
+    outcome=None,
+    thresholds: Sequence[float] = (),
+    n_replicates: int = 1000,
+    level: float = 0.95,
+    method: str = "percentile",
+    seed: Optional[int] = None,
+    n_workers: Optional[int] = None,
+) -> Dict[str, object]:
+    """
+    Bootstrap confidence intervals for cohort risk summaries, from one scoring pass.
+
+    risk:        predicted risks/scores already produced by a batch scorer
+    outcome:     optional 0/1 outcome; adds the C-statistic
+    thresholds:  cut-offs in the units of `risk` (e.g. 2.5 for the COPD score); each
+                 adds the proportion of the cohort at or above it
+    method:      "percentile" or "bca" (bias-corrected and accelerated; the acceleration
+                 uses closed-form jackknife values, so it stays O(n log n))
+    seed:        seeds a SeedSequence; replicate streams are reproducible and
+                 independent of `n_workers`
+    n_workers:   process count (default: all cores); 1 runs in-process
+
+    The cohort is sorted by risk once; each replicate draws resampled row counts and
+    re-evaluates all statistics as weighted sums in O(n). With several workers, the
+    sorted arrays live in shared memory and each process maps them read-only.
+
+    Returns:
+      {
+        'n_replicates', 'level', 'method',
+        'mean_risk':      {'estimate', 'lower', 'upper'},
+        'above_threshold': {threshold: {'estimate', 'lower', 'upper'}},
+        'c_statistic':    {'estimate', 'lower', 'upper'}   # only with outcome
+      }
+    """
+    if method not in ("percentile", "bca"):
+        raise ValueError("method must be 'percentile' or 'bca'")
+    n_replicates = int(n_replicates)
+    if n_replicates < 1:
+        raise ValueError(f"n_replicates must be at least 1, got {n_replicates}.")
+    r = np.asarray(risk, dtype=float).reshape(-1)
+    if r.size < 2:
+        raise ValueError("At least two rows are required.")
+    y = None
+    if outcome is not None:
+        y = np.asarray(outcome, dtype=float).reshape(-1)
+        if y.shape != r.shape:
+            raise ValueError("'risk' and 'outcome' must have the same length.")
+
+    thresholds = [float(t) for t in thresholds]
+    arrays = _prepare(r, y, thresholds)
+    estimate = _statistics(arrays, np.ones(r.size))
+
+    n_blocks = -(-n_replicates // _BLOCK)
+    seeds = np.random.SeedSequence(seed).spawn(n_blocks)
+    counts = [min(_BLOCK, n_replicates - i * _BLOCK) for i in range(n_blocks)]
+    n_workers = min(n_workers or os.cpu_count() or 1, n_blocks)
+
+    if n_workers <= 1:
+        reps = [_replicates(arrays, s, c) for s, c in zip(seeds, counts)]
+    else:
+        blocks, specs = [], {}
+        try:
+            for name, arr in arrays.items():
+                shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+                blocks.append(shm)
+                np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+                specs[name] = (shm.name, arr.shape, arr.dtype.str)
+            with ProcessPoolExecutor(n_workers, initializer=_attach, initargs=(specs,)) as pool:
+                reps = list(pool.map(_worker, seeds, counts))
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+    reps = np.concatenate(reps, axis=0)
+
+    jack = _jackknife(arrays, estimate) if method == "bca" else [None] * estimate.size
+
+    def summary(k: int) -> Dict[str, float]:
+        lo, hi = _interval(reps[:, k], float(estimate[k]), jack[k], level, method)
+        return {"estimate": float(estimate[k]), "lower": lo, "upper": hi}
+
+    result: Dict[str, object] = {
+        "n_replicates": int(n_replicates),
+        "level": float(level),
+        "method": method,
+        "mean_risk": summary(0),
+        "above_threshold": {t: summary(1 + i) for i, t in enumerate(thresholds)},
+    }
+    if y is not None:
+        result["c_statistic"] = summary(1 + len(thresholds))
+    return result
@@ -0,0 +1,262 @@
+import math
+from typing import Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
+from ..common.batch import group_codes
+
+# Survival factors are floored here so that per-group cumulative log sums stay finite.
+_MIN_FACTOR = 1e-12
+
+
+def _as_1d(name: str, values, n: Optional[int] = None) -> np.ndarray:
+    arr = np.asarray(values, dtype=float).reshape(-1)
+    if n is not None and arr.shape[0] != n:
+        raise ValueError(f"{name!r} has {arr.shape[0]} rows, expected {n}.")
+    return arr
+
+
+def _km_table(codes: np.ndarray, n_groups: int, time: np.ndarray, event: np.ndarray):
+    """
+    Kaplan–Meier survival per group, from one sort of (group, time).
+
+    Returns (run_key, surv, utimes, row_left): run_key encodes group * len(utimes) + time
+    rank for every distinct (group, time) pair in ascending order, surv is S(t) just after
+    it, and row_left is S(t-) at each input row's own time.
+    """
+    utimes, trank = np.unique(time, return_inverse=True)
+    u = max(len(utimes), 1)
+    key = codes * u + trank.reshape(-1)
+    run_key, run_inv, run_n = np.unique(key, return_inverse=True, return_counts=True)
+    if run_key.size == 0:
+        return run_key, np.empty(0), utimes, np.empty(0)
+    run_inv = run_inv.reshape(-1)
+
+    run_d = np.bincount(run_inv, weights=event, minlength=run_key.size)
+    run_g = run_key // u
+    sizes = np.bincount(codes, minlength=n_groups)
+    group_before = np.cumsum(sizes) - sizes
+    rows_before = np.cumsum(run_n) - run_n
+    at_risk = sizes[run_g] - (rows_before - group_before[run_g])
+
+    logs = np.log(np.maximum(1.0 - run_d / at_risk, _MIN_FACTOR))
+    cum = np.cumsum(logs)
+    first = np.searchsorted(run_g, np.arange(n_groups), side="left")[run_g]
+    base = cum[first] - logs[first]
+    surv = np.exp(cum - base)
+    left = np.exp(cum - logs - base)
+    return run_key, surv, utimes, left[run_inv]
+
+
+def _km_at(table, n_groups: int, t: float) -> np.ndarray:
+    """Evaluate a `_km_table` at S(t) for every group code 0..n_groups-1."""
+    run_key, surv, utimes, _ = table
+    if run_key.size == 0:
+        return np.ones(n_groups)
+    u = max(len(utimes), 1)
+    codes = np.arange(n_groups)
+    rank = np.searchsorted(utimes, t, side="right") - 1
+    pos = np.searchsorted(run_key, codes * u + rank, side="right") - 1
+    pos_c = np.clip(pos, 0, None)
+    hit = (rank >= 0) & (pos >= 0) & (run_key[pos_c] // u == codes)
+    return np.where(hit, surv[pos_c], 1.0)
+
+
+def _grouped_auc(
+    codes: np.ndarray,
+    n_groups: int,
+    score: np.ndarray,
+    case_w: np.ndarray,
+    ctrl_w: np.ndarray,
+) -> np.ndarray:
+    """
+    Weighted concordance (AUC) per group with ties counted as 1/2, in O(n log n).
+
+    One lexsort on (group, score); each run of tied scores contributes
+    case_weight * (control weight strictly below + 0.5 * tied control weight).
+    """
+    out = np.full(n_groups, np.nan)
+    if codes.size == 0:
+        return out
+    order = np.lexsort((score, codes))
+    c = codes[order]
+    s = score[order]
+    new_run = np.ones(c.size, dtype=bool)
+    new_run[1:] = (c[1:] != c[:-1]) | (s[1:] != s[:-1])
+    starts = np.flatnonzero(new_run)
+
+    run_case = np.add.reduceat(case_w[order], starts)
+    run_ctrl = np.add.reduceat(ctrl_w[order], starts)
+    run_g = c[starts]
+    ctrl_before = np.cumsum(run_ctrl) - run_ctrl
+    first = np.searchsorted(run_g, np.arange(n_groups), side="left")[run_g]
+    below = ctrl_before - ctrl_before[first]
+
+    num = np.bincount(run_g, weights=run_case * (below + 0.5 * run_ctrl), minlength=n_groups)
+    w1 = np.bincount(codes, weights=case_w, minlength=n_groups)
+    w0 = np.bincount(codes, weights=ctrl_w, minlength=n_groups)
+    denom = w1 * w0
+    ok = denom > 0
+    out[ok] = num[ok] / denom[ok]
+    return out
+
+
+def _within_group_bins(codes: np.ndarray, n_groups: int, risk: np.ndarray, n_bins: int) -> np.ndarray:
+    """Quantile bin (0..n_bins-1) of each row's risk within its own group."""
+    order = np.lexsort((risk, codes))
+    sizes = np.bincount(codes, minlength=n_groups)
+    before = np.cumsum(sizes) - sizes
+    c = codes[order]
+    pos = np.arange(codes.size) - before[c]
+    bins = np.empty(codes.size, dtype=np.int64)
+    bins[order] = (pos * n_bins) // sizes[c]
+    return bins
+
+
+def _metrics_by_code(
+    codes: np.ndarray,
+    n_groups: int,
+    p: np.ndarray,
+    y: np.ndarray,
+    time: Optional[np.ndarray],
+    horizon: Optional[float],
+    need_auc: bool = True,
+) -> Dict[str, np.ndarray]:
+    """All per-group metrics for probabilities p in [0, 1]; one array entry per code."""
+    n = np.bincount(codes, minlength=n_groups).astype(float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_p = np.bincount(codes, weights=p, minlength=n_groups) / n
+
+        if time is None:
+            events = np.bincount(codes, weights=y, minlength=n_groups)
+            observed = events / n
+            brier = np.bincount(codes, weights=(p - y) ** 2, minlength=n_groups) / n
+            auc = _grouped_auc(codes, n_groups, p, y, 1.0 - y) if need_auc else None
+        else:
+            case = (y > 0) & (time <= horizon)
+            ctrl = time > horizon
+            events = np.bincount(codes, weights=case, minlength=n_groups)
+
+            # Outcome incidence at the horizon (Kaplan–Meier) and the censoring
+            # distribution G used for inverse-probability-of-censoring weights.
+            surv_tab = _km_table(codes, n_groups, time, y)
+            observed = 1.0 - _km_at(surv_tab, n_groups, float(horizon))
+
+            cens_tab = _km_table(codes, n_groups, time, 1.0 - y)
+            g_own = cens_tab[3]
+            g_h = _km_at(cens_tab, n_groups, float(horizon))[codes]
+            w_case = np.where(case, 1.0 / g_own, 0.0)
+            w_ctrl = np.where(ctrl, 1.0 / g_h, 0.0)
+
+            resid = w_case * (1.0 - p) ** 2 + w_ctrl * p ** 2
+            brier = np.bincount(codes, weights=resid, minlength=n_groups) / n
+            # Controls share one weight within a group, which cancels in the ratio.
+            auc = _grouped_auc(codes, n_groups, p, w_case, ctrl.astype(float)) if need_auc else None
+
+        oe = observed / mean_p
+
+    return {
+        "n": n,
+        "events": events,
+        "mean_p": mean_p,
+        "observed": observed,
+        "oe": oe,
+        "brier": brier,
+        "auc": auc,
+    }
+
+
+def _num(x) -> float:
+    x = float(x)
+    return x if math.isfinite(x) else float("nan")
+
+
+def evaluate_performance(
+    risk,
+    outcome,
+    time=None,
+    horizon: Optional[float] = None,
+    groups: Optional[Mapping[str, object]] = None,
+    n_bins: int = 10,
+    scale: float = 100.0,
+) -> Dict[Tuple, Dict[str, object]]:
+    """
+    Discrimination and calibration of predicted risks against observed outcomes.
+
+    risk:    predicted risks, as returned by the calculators (percent; see `scale`)
+    outcome: 0/1 event indicator
+    time:    optional follow-up time (years). When given, outcomes are treated as
+             censored time-to-event data evaluated at `horizon` (e.g. 5 for CKD-PC and
+             GDRS, 10 for SCORE2) with inverse-probability-of-censoring weights.
+    groups:  optional mapping of subgroup columns (e.g. {"region": ..., "sex": ...});
+             every subgroup is evaluated from the same sorts.
+    scale:   divisor that turns `risk` into a probability (100 for percent, 1 for 0–1).
+
+    Returns {group_key: metrics}, where group_key is the tuple of subgroup values and
+    () holds the whole cohort. Metrics:
+      n, events, mean_risk, observed_risk, oe_ratio (risk units as `risk`),
+      c_statistic (binary AUC, or cumulative/dynamic AUC at the horizon),
+      brier (probability scale; IPCW Brier score when censored),
+      calibration: list of {bin, n, mean_risk, observed_risk} by within-group risk decile.
+    """
+    p = _as_1d("risk", risk) / float(scale)
+    n_rows = p.shape[0]
+    y = _as_1d("outcome", outcome, n_rows)
+    t = None
+    if time is not None:
+        if horizon is None:
+            raise ValueError("'horizon' is required with time-to-event outcomes.")
+        t = _as_1d("time", time, n_rows)
+
+    results: Dict[Tuple, Dict[str, object]] = {}
+    layouts = [(np.zeros(n_rows, dtype=np.int64), [()])]
+    if groups:
+        layouts.append(group_codes(groups, n_rows))
+
+    for codes, keys in layouts:
+        n_groups = len(keys)
+        m = _metrics_by_code(codes, n_groups, p, y, t, horizon)
+
+        bins = _within_group_bins(codes, n_groups, p, n_bins)
+        bin_codes = codes * n_bins + bins
+        mb = _metrics_by_code(bin_codes, n_groups * n_bins, p, y, t, horizon, need_auc=False)
+
+        for k, key in enumerate(keys):
+            calibration = []
+            for b in range(n_bins):
+                j = k * n_bins + b
+                if mb["n"][j] == 0:
+                    continue
+                calibration.append({
+                    "bin": b + 1,
+                    "n": int(mb["n"][j]),
+                    "mean_risk": _num(mb["mean_p"][j] * scale),
+                    "observed_risk": _num(mb["observed"][j] * scale),
+                })
+            results[key] = {
+                "n": int(m["n"][k]),
+                "events": int(m["events"][k]),
+                "mean_risk": _num(m["mean_p"][k] * scale),
+                "observed_risk": _num(m["observed"][k] * scale),
+                "oe_ratio": _num(m["oe"][k]),
+                "c_statistic": _num(m["auc"][k]),
+                "brier": _num(m["brier"][k]),
+                "calibration": calibration,
+            }
+    return results
+
+
+def c_statistic(risk, outcome, time=None, horizon: Optional[float] = None) -> float:
+    """
+    C-statistic of `risk` for a binary `outcome`, or the IPCW cumulative/dynamic AUC at
+    `horizon` when follow-up `time` is given. Sort-based, O(n log n).
+    """
+    p = _as_1d("risk", risk)
+    y = _as_1d("outcome", outcome, p.shape[0])
+    codes = np.zeros(p.shape[0], dtype=np.int64)
+    if time is None:
+        return _num(_grouped_auc(codes, 1, p, y, 1.0 - y)[0])
+    if horizon is None:
+        raise ValueError("'horizon' is required with time-to-event outcomes.")
+    t = _as_1d("time", time, p.shape[0])
+    return _num(_metrics_by_code(codes, 1, p, y, t, horizon)["auc"][0])
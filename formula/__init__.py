@@ -0,0 +1,3 @@
+from .formula_core import FormulaModel, Kernel, check_parity, compile_bundle, compile_formulas, parse
+
+__all__ = ["FormulaModel", "Kernel", "check_parity", "compile_bundle", "compile_formulas", "parse"]
@@ -0,0 +1,542 @@
+import ast
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..common.batch import as_float, category_index, weighted_sum
+from ..plcom2012.plcom2012_batch import _plco_constants
+
+# Functions allowed in formulas: name -> (IR op, number of arguments; None = 2 or more)
+_FUNCTIONS = {
+    "pmax": ("max", None),
+    "max": ("max", None),
+    "pmin": ("min", None),
+    "min": ("min", None),
+    "pow": ("pow", 2),
+    "log": ("log", 1),
+    "log10": ("log10", 1),
+    "exp": ("exp", 1),
+    "sqrt": ("sqrt", 1),
+    "abs": ("abs", 1),
+}
+_BINOPS = {ast.Add: "add", ast.Sub: "sub", ast.Mult: "mul", ast.Div: "div", ast.Pow: "pow"}
+_CMPOPS = {ast.Eq: "eq", ast.NotEq: "ne", ast.Lt: "lt", ast.LtE: "le", ast.Gt: "gt", ast.GtE: "ge"}
+
+# How each IR op is emitted; operands are variable names or literals.
+_EMIT = {
+    "add": "{0} + {1}",
+    "sub": "{0} - {1}",
+    "mul": "{0} * {1}",
+    "div": "{0} / {1}",
+    "pow": "np.power({0}, {1})",
+    "neg": "-{0}",
+    "max": "np.maximum({0}, {1})",
+    "min": "np.minimum({0}, {1})",
+    "log": "np.log({0})",
+    "log10": "np.log10({0})",
+    "exp": "np.exp({0})",
+    "sqrt": "np.sqrt({0})",
+    "abs": "np.abs({0})",
+    "eq": "np.equal({0}, {1})",
+    "ne": "np.not_equal({0}, {1})",
+    "lt": "np.less({0}, {1})",
+    "le": "np.less_equal({0}, {1})",
+    "gt": "np.greater({0}, {1})",
+    "ge": "np.greater_equal({0}, {1})",
+    "and": "np.logical_and({0}, {1})",
+    "or": "np.logical_or({0}, {1})",
+    "not": "np.logical_not({0})",
+    "float": "np.asarray({0}, dtype=float)",
+    "where": "np.where({0}, {1}, {2})",
+}
+
+
+def _ckdpc_albuminuria(bundle: Mapping, table: Mapping[str, str]) -> str:
+    # missing (NaN) or non-positive ACR contributes nothing, as in ckdpc_core
+    return f"({table['albuminuria_term']}) if ACR > 0 else 0"
+
+
+def _plco_intensity(bundle: Mapping, table: Mapping[str, str]) -> str:
+    # cigarettes/day / 10 is floored at 1e-6, so 0 cigarettes/day stays finite
+    center_const = _plco_constants(bundle)[-1]
+    return f"(pmax(smoking_intensity_cigs_per_day / 10.0, 1e-6) ** -1.0) - {center_const!r}"
+
+
+def _plco_quit_time(bundle: Mapping, table: Mapping[str, str]) -> str:
+    # quit time is 0 for current smokers and when missing (NaN); centered on the bundle's constant
+    center = _plco_constants(bundle)[4]
+    return (f"(quit_time_years if smoking_status != 'current' and quit_time_years == quit_time_years else 0)"
+            f" - {center!r}")
+
+
+# Coding and missing-value rules that the packaged bundles state only in prose (or
+# leave to the hand-written scorers), keyed by model_id. A value may be a function
+# of the bundle and the definitions collected so far, when the rule uses one of the
+# bundle's constants or wraps the bundle's own formula.
+_MODEL_DEFINITIONS: Dict[str, Dict[str, Union[str, Callable[[Mapping, Mapping[str, str]], str]]]] = {
+    "ckdpc_2019_incident_ckd_egfr_lt60_all_events": {
+        "expected_log10acr": "expected_log10acr_nondiabetic",
+        "albuminuria_term": _ckdpc_albuminuria,
+    },
+    "clivd_2022_chronic_liver_disease_modellab": {
+        # negative intake counts as none (the spline terms are already 0 there)
+        "alcohol_linear": "pmax(alcohol, 0)",
+    },
+    "plcom2012_lung_cancer_6y": {
+        "smoking_intensity_term": _plco_intensity,
+        "quit_time_centered": _plco_quit_time,
+    },
+}
+
+
+def parse(expr: str) -> ast.Expression:
+    """
+    Parse a bundle formula into a Python expression AST. R-style `^` means power.
+    Only the syntax in `compile_formulas` is accepted later; nothing is evaluated.
+    """
+    try:
+        return ast.parse(expr.replace("^", "**").strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Cannot parse formula {expr!r}: {e.msg}") from e
+
+
+class _Graph:
+    """Hash-consed expression DAG: structurally equal subexpressions share one node."""
+
+    def __init__(self, resolve: Callable[[str, Optional[str]], int]):
+        self.nodes: List[Tuple] = []
+        self._index: Dict[Tuple, int] = {}
+        self._resolve = resolve
+
+    def node(self, op: str, *args) -> int:
+        key = (op,) + args
+        if key not in self._index:
+            self._index[key] = len(self.nodes)
+            self.nodes.append(key)
+        return self._index[key]
+
+    def const(self, value) -> int:
+        return self.node("const", float(value) if not isinstance(value, str) else value)
+
+    def _const_value(self, i: int):
+        n = self.nodes[i]
+        return n[1] if n[0] == "const" else None
+
+    def op(self, op: str, *args: int) -> int:
+        values = [self._const_value(a) for a in args]
+        if all(v is not None and not isinstance(v, str) for v in values):
+            # constant folding
+            ns = {"np": np}
+            return self.const(float(eval(_EMIT[op].format(*map(repr, values)), ns)))
+        a = values[0]
+        b = values[1] if len(values) > 1 else None
+        if op == "mul" and a == 1.0:
+            return args[1]
+        if op in ("mul", "div", "pow") and b == 1.0:
+            return args[0]
+        if op in ("add", "sub") and b == 0.0:
+            return args[0]
+        if op == "add" and a == 0.0:
+            return args[1]
+        if op == "pow" and b in (2.0, 3.0):
+            # small integer powers as products (cheaper than np.power)
+            sq = self.node("mul", args[0], args[0])
+            return sq if b == 2.0 else self.node("mul", sq, args[0])
+        if op in ("mul", "add", "max", "min", "eq", "ne", "and", "or") and args[0] > args[1]:
+            args = (args[1], args[0])  # commutative: canonical operand order for sharing
+        return self.node(op, *args)
+
+    def build(self, tree: ast.AST, scope: Optional[str], expr: str) -> int:
+        t = tree.body if isinstance(tree, ast.Expression) else tree
+        if isinstance(t, ast.Constant) and isinstance(t.value, (int, float, str)):
+            return self.const(t.value)
+        if isinstance(t, ast.Name):
+            return self._resolve(t.id, scope)
+        if isinstance(t, ast.BinOp) and type(t.op) in _BINOPS:
+            return self.op(_BINOPS[type(t.op)], self.build(t.left, scope, expr), self.build(t.right, scope, expr))
+        if isinstance(t, ast.UnaryOp) and isinstance(t.op, ast.USub):
+            return self.op("neg", self.build(t.operand, scope, expr))
+        if isinstance(t, ast.UnaryOp) and isinstance(t.op, ast.UAdd):
+            return self.build(t.operand, scope, expr)
+        if isinstance(t, ast.UnaryOp) and isinstance(t.op, ast.Not):
+            return self.op("not", self.build(t.operand, scope, expr))
+        if isinstance(t, ast.Compare) and all(type(o) in _CMPOPS for o in t.ops):
+            operands = [self.build(x, scope, expr) for x in [t.left] + t.comparators]
+            result = None
+            for o, lhs, rhs in zip(t.ops, operands, operands[1:]):
+                part = self.op(_CMPOPS[type(o)], lhs, rhs)
+                result = part if result is None else self.op("and", result, part)
+            return result
+        if isinstance(t, ast.BoolOp):
+            values = [self.build(x, scope, expr) for x in t.values]
+            result = values[0]
+            for v in values[1:]:
+                result = self.op("and" if isinstance(t.op, ast.And) else "or", result, v)
+            return result
+        if isinstance(t, ast.IfExp):
+            cond = self.build(t.test, scope, expr)
+            yes, no = self.build(t.body, scope, expr), self.build(t.orelse, scope, expr)
+            if self._const_value(yes) == 1.0 and self._const_value(no) == 0.0:
+                return self.op("float", cond)  # indicator
+            if self._const_value(yes) == 0.0 and self._const_value(no) == 1.0:
+                return self.op("float", self.op("not", cond))
+            return self.node("where", cond, yes, no)
+        if isinstance(t, ast.Call) and isinstance(t.func, ast.Name) and t.func.id in _FUNCTIONS and not t.keywords:
+            op, arity = _FUNCTIONS[t.func.id]
+            args = [self.build(a, scope, expr) for a in t.args]
+            if (arity is None and len(args) < 2) or (arity is not None and len(args) != arity):
+                raise ValueError(f"Wrong number of arguments to {t.func.id}() in formula {expr!r}")
+            result = args[0]
+            for a in args[1:]:
+                result = self.op(op, result, a)
+            return result if len(args) > 1 else self.op(op, result)
+        raise ValueError(f"Unsupported syntax {type(t).__name__} in formula {expr!r}")
+
+
+class Kernel:
+    """
+    A compiled set of formulas: one straight-line NumPy function evaluating every
+    output, with shared subexpressions computed once and temporaries released as
+    soon as they are dead.
+
+    inputs:  free input names the kernel reads
+    outputs: names of the values it returns
+    source:  the generated Python source (for inspection)
+
+    When every input is a float64 (or string) array of at least one dimension, the
+    fused variant runs: elementwise steps whose operand is a dead temporary and whose
+    other operands are constants write into that temporary (`out=`) instead of
+    allocating a new array. Otherwise (scalars, integer arrays) the plain variant runs.
+    """
+
+    def __init__(self, inputs: Tuple[str, ...], outputs: Tuple[str, ...], graph: _Graph, nodes: Dict[str, int]):
+        self.inputs = inputs
+        self.outputs = outputs
+        self.source = _emit(graph, nodes, inplace=True)
+        self._fn = self._build(_emit(graph, nodes, inplace=False))
+        self._fused = self._build(self.source)
+
+    @staticmethod
+    def _build(source: str) -> Callable:
+        namespace: Dict[str, object] = {"np": np}
+        exec(compile(source, "<formula kernel>", "exec"), namespace)
+        return namespace["kernel"]
+
+    def __call__(self, env: Mapping[str, object]) -> Dict[str, np.ndarray]:
+        missing = [name for name in self.inputs if name not in env]
+        if missing:
+            raise KeyError(f"Missing inputs: {missing}")
+        fused = all(
+            isinstance(env[name], np.ndarray) and env[name].ndim > 0
+            and (env[name].dtype == np.float64 or env[name].dtype.kind in "US")
+            for name in self.inputs
+        )
+        return dict(zip(self.outputs, (self._fused if fused else self._fn)(env)))
+
+
+# Ufuncs for the elementwise ops that can write into an operand's buffer.
+_UFUNCS = {
+    "add": "np.add", "sub": "np.subtract", "mul": "np.multiply", "div": "np.true_divide",
+    "pow": "np.power", "neg": "np.negative", "max": "np.maximum", "min": "np.minimum",
+    "log": "np.log", "log10": "np.log10", "exp": "np.exp", "sqrt": "np.sqrt", "abs": "np.abs",
+}
+
+
+def _emit(graph: _Graph, outputs: Dict[str, int], inplace: bool) -> str:
+    """Generate the kernel source for the nodes reachable from `outputs`."""
+    needed = set()
+    stack = list(outputs.values())
+    while stack:
+        i = stack.pop()
+        if i in needed:
+            continue
+        needed.add(i)
+        op, *args = graph.nodes[i]
+        if op not in ("const", "input"):
+            stack.extend(args)
+    order = sorted(needed)  # children always precede parents
+
+    def ref(i: int) -> str:
+        op, *args = graph.nodes[i]
+        return repr(args[0]) if op == "const" else f"v{i}"
+
+    last_use: Dict[int, int] = {}
+    for i in order:
+        op, *args = graph.nodes[i]
+        if op not in ("const", "input"):
+            for a in args:
+                last_use[a] = i
+    keep = set(outputs.values())
+
+    lines = ["def kernel(env):"]
+    for i in order:
+        op, *args = graph.nodes[i]
+        if op == "const":
+            if i in keep:
+                lines.append(f"    v{i} = {args[0]!r}")
+            continue
+        if op == "input":
+            lines.append(f"    v{i} = env[{args[0]!r}]")
+            continue
+        dead = [a for a in dict.fromkeys(args) if last_use.get(a) == i and a not in keep
+                and graph.nodes[a][0] != "const"]
+        reuse = [a for a in dead if graph.nodes[a][0] in _UFUNCS or graph.nodes[a][0] == "float"]
+        others_const = sum(graph.nodes[a][0] != "const" for a in args) == 1
+        if inplace and op in _UFUNCS and reuse and others_const:
+            operands = ", ".join(ref(a) for a in args)
+            lines.append(f"    v{i} = {_UFUNCS[op]}({operands}, out=v{reuse[0]})")
+        else:
+            lines.append(f"    v{i} = " + _EMIT[op].format(*(ref(a) for a in args)))
+        if dead:
+            lines.append("    del " + ", ".join(f"v{a}" for a in dead))
+    lines.append("    return (" + "".join(f"v{i}, " for i in outputs.values()) + ")")
+    return "\n".join(lines) + "\n"
+
+
+def compile_formulas(
+    outputs: Sequence[str],
+    definitions: Mapping[str, str],
+    inputs: Optional[Mapping[str, Mapping]] = None,
+) -> Kernel:
+    """
+    Compile named formulas into one Kernel.
+
+    outputs:     names to compute (each a key of `definitions` or an input)
+    definitions: {name: formula}. Formulas may use + - * / ** (or ^), unary minus,
+                 comparisons (also chained), and/or/not, `a if cond else b`
+                 (`1 if cond else 0` becomes an indicator), numbers, quoted strings
+                 and pmax/max, pmin/min, pow, log, log10, exp, sqrt, abs. Names refer
+                 to other definitions or to inputs. A name "scope.name" looks up
+                 unqualified names in its own scope first ("scope.x" for "x"), so
+                 multi-step helper definitions stay local. A formula that is exactly
+                 another definition's name (dotted names included) is an alias.
+    inputs:      optional input specs {name: {"truncate_max": ..., "truncate_min": ...}};
+                 truncation is applied where the input is read
+
+    Anything else (attributes, subscripts, other calls, ...) is rejected, so bundle
+    text is never executed as code. Raises ValueError for bad formulas or cyclic
+    definitions.
+    """
+    inputs = dict(inputs or {})
+    input_nodes: Dict[str, int] = {}
+    resolved: Dict[str, int] = {}
+    active: List[str] = []
+
+    def resolve(name: str, scope: Optional[str]) -> int:
+        if scope is not None and f"{scope}.{name}" in definitions:
+            name = f"{scope}.{name}"
+        if name in resolved:
+            return resolved[name]
+        if name in definitions:
+            if name in active:
+                raise ValueError(f"Cyclic formula definitions: {' -> '.join(active + [name])}")
+            active.append(name)
+            expr = definitions[name]
+            if expr in definitions:
+                node = resolve(expr, None)  # alias of another definition (e.g. a formula_ref)
+            else:
+                node = graph.build(parse(expr), name.rsplit(".", 1)[0] if "." in name else None, expr)
+            active.pop()
+        else:
+            node = graph.node("input", name)
+            input_nodes[name] = node
+            spec = inputs.get(name, {})
+            if "truncate_min" in spec:
+                node = graph.op("max", node, graph.const(spec["truncate_min"]))
+            if "truncate_max" in spec:
+                node = graph.op("min", node, graph.const(spec["truncate_max"]))
+        resolved[name] = node
+        return node
+
+    graph = _Graph(resolve)
+    out_nodes = {name: resolve(name, None) for name in outputs}
+    return Kernel(tuple(input_nodes), tuple(out_nodes), graph, out_nodes)
+
+
+def _helper_definitions(helpers: Mapping, prefix: str = "") -> Dict[str, str]:
+    """
+    Named formulas from a bundle's `shared_transform_helpers`:
+      {"key": {"formula": ...}}                  -> key
+      {"key": {"terms": [{"name", "formula"}]}}  -> each term name
+      {"key": {"formulas" | "steps": ["a = ..."]}} -> key.a (steps see each other)
+    """
+    found: Dict[str, str] = {}
+    for key, value in helpers.items():
+        if not isinstance(value, Mapping):
+            continue
+        name = prefix + key
+        if isinstance(value.get("formula"), str):
+            found[name] = value["formula"]
+        for term in value.get("terms", []):
+            if isinstance(term, Mapping) and "formula" in term:
+                found[term["name"]] = term["formula"]
+        for line in (*value.get("formulas", ()), *value.get("steps", ())):
+            if isinstance(line, str) and "=" in line:
+                lhs, rhs = line.split("=", 1)
+                found[f"{name}.{lhs.strip()}"] = rhs.strip()
+    return found
+
+
+class FormulaModel:
+    """
+    A linear-predictor model compiled from its bundle.
+
+    Call with input arrays keyed by the bundle's input names. Inputs with a bundle
+    `coding` (e.g. CLivD sex {"male": 1, "female": 2}) may be passed as labels;
+    numeric inputs are read as float64 (None -> NaN). Returns
+      {
+        'linear_predictor': array,
+        'risk': probability at the bundle horizon,      # logistic / Weibull risk models
+        'hazard_ratio': exp(LP),                        # models without a risk model
+        'contributions', 'terms'                        # with contributions=True
+      }
+    """
+
+    def __init__(self, lp_def: Mapping, risk_model: Optional[Mapping], inputs: Sequence[Mapping], kernel: Kernel):
+        self.terms = tuple(t["name"] for t in lp_def["terms"])
+        self.coefficients = {t["name"]: float(t["coefficient"]) for t in lp_def["terms"]}
+        self.intercept = float(lp_def.get("intercept", 0.0))
+        self.risk_model = dict(risk_model) if risk_model else None
+        self.input_specs = {spec["name"]: dict(spec) for spec in inputs}
+        self.kernel = kernel
+        self.inputs = kernel.inputs
+
+    def _encode(self, name: str, values) -> np.ndarray:
+        arr = np.asarray(values)
+        coding = self.input_specs.get(name, {}).get("coding")
+        if coding and arr.dtype.kind in "US":
+            codes = np.array([float(v) for v in coding.values()])
+            return codes[category_index(arr, list(coding), name)]
+        if arr.dtype.kind in "US":
+            return arr
+        return as_float(arr)
+
+    def __call__(self, contributions: bool = False, **inputs) -> Dict[str, np.ndarray]:
+        env = {name: self._encode(name, inputs[name]) for name in self.inputs if name in inputs}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # guarded branches (e.g. log10 of a missing ACR) are computed and then discarded
+            values = self.kernel(env)
+        lp, matrix = weighted_sum(self.intercept, self.coefficients, values, self.terms, contributions)
+
+        out: Dict[str, np.ndarray] = {"linear_predictor": lp}
+        kind = (self.risk_model or {}).get("type")
+        if kind == "logistic":
+            out["risk"] = 1.0 / (1.0 + np.exp(-lp))
+        elif kind == "fine_gray_weibull":
+            horizon = float(self.risk_model["horizon_years"])
+            out["risk"] = 1.0 - np.exp(-(horizon ** float(self.risk_model["gamma"])) * np.exp(lp))
+        elif kind is None:
+            out["hazard_ratio"] = np.exp(lp)
+        else:
+            raise ValueError(f"Unsupported risk model type {kind!r}.")
+        if contributions:
+            out["contributions"] = matrix
+            out["terms"] = self.terms
+        return out
+
+
+def compile_bundle(
+    bundle: Mapping,
+    sub_model: Optional[str] = None,
+    definitions: Optional[Mapping[str, str]] = None,
+) -> FormulaModel:
+    """
+    Compile a linear-predictor bundle (the `model`, or `models[sub_model]` layout of
+    the CKD-PC, CLivD and PLCOm2012 bundles) into a FormulaModel.
+
+    Each term is computed from, in order of precedence: `definitions`, the bundle's
+    top-level `definitions`, the term's `formula` / `formula_ref`, formulas in
+    `shared_transform_helpers`, or the input of the same name. Inputs with
+    `truncate_max` / `truncate_min` are truncated. A new model therefore needs only a
+    bundle whose terms are expressed in these formulas.
+    """
+    if sub_model is not None:
+        model = bundle["models"][sub_model]
+    elif "model" in bundle and isinstance(bundle["model"], Mapping):
+        model = bundle["model"]
+    else:
+        raise ValueError(f"Bundle has sub-models {sorted(bundle.get('models', {}))}; pass sub_model.")
+    lp_def = model["linear_predictor"]
+
+    table = _helper_definitions(bundle.get("shared_transform_helpers", {}))
+    for term in lp_def["terms"]:
+        if "formula" in term:
+            table[term["name"]] = term["formula"]
+        elif "formula_ref" in term:
+            ref = term["formula_ref"]
+            if ref not in table:
+                raise ValueError(f"Term {term['name']!r} refers to unknown formula {ref!r}.")
+            table[term["name"]] = ref
+    for name, rule in _MODEL_DEFINITIONS.get(bundle.get("model_id"), {}).items():
+        table[name] = rule(bundle, table) if callable(rule) else rule
+    table.update(bundle.get("definitions", {}))
+    table.update(definitions or {})
+
+    inputs = model.get("inputs", [])
+    kernel = compile_formulas(
+        [t["name"] for t in lp_def["terms"]],
+        table,
+        {spec["name"]: spec for spec in inputs},
+    )
+    return FormulaModel(lp_def, model.get("risk_model"), inputs, kernel)
+
+
+def check_parity(n: int = 10000, seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """
+    Compare the compiled CKD-PC, CLivD and PLCOm2012 bundles with the models' batch
+    scorers (`MODELS[name]["scorer"]`) on `backends.sample_inputs` rows, with the
+    inputs those scorers accept at the edges mixed in: missing, zero and negative
+    ACR, negative alcohol intake, 0 cigarettes/day and missing quit time.
+
+    Returns {model: {output: max absolute difference}} (NaN in only one side counts
+    as infinite).
+    """
+    from ..backends.backends_core import _max_abs_diff, sample_inputs
+    from ..common.models import MODELS, score_model
+
+    rng = np.random.default_rng(seed)
+    report: Dict[str, Dict[str, float]] = {}
+
+    inputs = sample_inputs("ckdpc", n, seed)
+    edge = rng.random(n)
+    inputs["acr_mg_g"] = np.where(edge < 0.1, 0.0, np.where(edge < 0.15, -1.0, inputs["acr_mg_g"]))
+    bundle = MODELS["ckdpc"]["load_bundle"]()
+    want = score_model("ckdpc", inputs, bundle)["risk_5y"]
+    env = {
+        "age": inputs["age"], "female": (inputs["sex"] == "female").astype(float), "black": inputs["black"],
+        "eGFR": inputs["egfr"], "history_cvd": inputs["history_cvd"], "ever_smoker": inputs["ever_smoker"],
+        "hypertensive": inputs["hypertensive"], "BMI": inputs["bmi"], "ACR": inputs["acr_mg_g"],
+        "hba1c": inputs["hba1c"], "dm_medication_status": inputs["dm_medication_status"],
+    }
+    risks = []
+    for sub_model in ("nondiabetic", "diabetic"):
+        model = compile_bundle(bundle, sub_model)
+        risks.append(model(**{k: env[k] for k in model.inputs})["risk"] * 100.0)
+    got = np.where(inputs["diabetes"] > 0, risks[1], risks[0])
+    report["ckdpc"] = {"risk_5y": _max_abs_diff(got, want)}
+
+    inputs = sample_inputs("clivd", n, seed)
+    inputs["alcohol"] = np.where(rng.random(n) < 0.05, -1.0, inputs["alcohol"])
+    bundle = MODELS["clivd"]["load_bundle"]()
+    want = score_model("clivd", inputs, bundle)
+    out = compile_bundle(bundle)(
+        age=inputs["age"], sex=inputs["sex"], waist_hip_ratio=inputs["whr"], alcohol=inputs["alcohol"],
+        ggt=inputs["ggt"], diabetes=inputs["diabetes"],
+        smoking=np.where(inputs["smoking"] == "current", "current", "never_or_past"),
+    )
+    report["clivd"] = {k: _max_abs_diff(out[k], want[k]) for k in ("linear_predictor", "hazard_ratio")}
+
+    inputs = sample_inputs("plcom2012", n, seed)
+    inputs["smoking_intensity_cigs_per_day"] = np.where(
+        rng.random(n) < 0.05, 0.0, inputs["smoking_intensity_cigs_per_day"])
+    bundle = MODELS["plcom2012"]["load_bundle"]()
+    env = {("race_ethnicity" if k == "race" else k): v for k, v in inputs.items()}
+    model = compile_bundle(bundle)
+    with np.errstate(over="ignore"):  # 0 cigarettes/day: LP near -1.8e6, probability 0
+        want = score_model("plcom2012", inputs, bundle)
+        out = model(**{k: env[k] for k in model.inputs})
+    report["plcom2012"] = {
+        "linear_predictor": _max_abs_diff(out["linear_predictor"], want["linear_predictor"]),
+        "prob_6y": _max_abs_diff(out["risk"], want["prob_6y"]),
+    }
+    return report
@@ -0,0 +1,120 @@
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+
+from ..common.batch import as_flag, as_float, category_index, float_dtype, weighted_sum
+
+
+def batch_tables(bundle: Dict) -> Dict[str, object]:
+    """
+    Bundle lookups for `gdrs_batch(tables=...)`: points per unit / per binary flag,
+    intake scaling, the smoking table, and the clinical extension constants.
+    """
+    variables = {v["name"]: v for v in bundle["original_points_model"]["variables"]}
+
+    def var(name: str) -> Dict:
+        if name not in variables:
+            raise KeyError(name)
+        return variables[name]
+
+    cats = var("smoking")["categories"]
+    coeffs = bundle["clinical_extension"]["clinical_points"]["coefficients"]
+    rm_clin = bundle["clinical_extension"]["risk_model"]
+    return {
+        "points_per_unit": {
+            name: float(var(name)["points_per_unit"])
+            for name in ("age", "height", "waist", "exercise", "wholegrains", "coffee", "redmeat")
+        },
+        "per": {
+            name: float(var(name).get("scaling", {}).get("per", 1.0)) for name in ("wholegrains", "coffee", "redmeat")
+        },
+        "points_if_true": {
+            name: float(var(name)["points_if_true"])
+            for name in ("hypertension", "diabetes_one_parent", "diabetes_both_parents", "diabetes_sibling")
+        },
+        "smoking_codes": tuple(c["code"] for c in cats),
+        "smoking_points": np.array([float(c["points"]) for c in cats]),
+        "original_points_mult": float(coeffs["original_points"]),
+        "hba1c_mult": float(coeffs["hba1c"]),
+        "intercept": float(bundle["clinical_extension"]["clinical_points"].get("intercept", 0.0)),
+        "baseline_survival": float(rm_clin["baseline_survival"]),
+        "mean_points": float(rm_clin["mean_points"]),
+        "scale": 100.0 if rm_clin.get("scale_per_100_points", True) else 1.0,
+    }
+
+
+def gdrs_batch(
+    age,
+    height,
+    waist,
+    hypertension,
+    exercise,
+    smoking,
+    wholegrains,
+    coffee,
+    redmeat,
+    diabetes_one_parent,
+    diabetes_both_parents,
+    diabetes_sibling,
+    hba1c,
+    bundle: Dict,
+    contributions: bool = False,
+    precision: str = "float64",
+    tables: Optional[Mapping] = None,
+):
+    """
+    Vectorized `gdrs`: every argument may be an array (arrays broadcast against each
+    other). Returns 5-year *clinical* GDRS risk (%) per row.
+
+    With `contributions`, returns {'risk_5y', 'contributions', 'terms'} instead:
+    'contributions' is (n, terms) clinical points per variable (original points times
+    the clinical multiplier, parental history combined as 'diabetes_parents', plus
+    'hba1c'), summing to the clinical points minus the intercept.
+
+    precision="float32" keeps inputs, points and the result in float32; centering on
+    the mean points and the survival transform are evaluated in float64.
+
+    `tables` is `batch_tables(bundle)`, for callers that score one bundle many times.
+    """
+    dtype = float_dtype(precision)
+    if tables is None:
+        tables = batch_tables(bundle)
+    ppu = tables["points_per_unit"]
+    per = tables["per"]
+    bin_points = tables["points_if_true"]
+    op_mult = tables["original_points_mult"]
+
+    smoking_table = tables["smoking_points"].astype(dtype, copy=False)
+    smoking_idx = category_index(smoking, tables["smoking_codes"], "smoking category")
+
+    # family history precedence
+    both = as_flag(diabetes_both_parents, dtype)
+    one = as_flag(diabetes_one_parent, dtype) * (1.0 - both)
+    parent_points = bin_points["diabetes_both_parents"] * both + bin_points["diabetes_one_parent"] * one
+
+    # original points per variable; HbA1c enters the clinical points with its own coefficient
+    points = {
+        "age": ppu["age"] * as_float(age, dtype),
+        "height": ppu["height"] * as_float(height, dtype),
+        "waist": ppu["waist"] * as_float(waist, dtype),
+        "hypertension": bin_points["hypertension"] * as_flag(hypertension, dtype),
+        "exercise": ppu["exercise"] * as_float(exercise, dtype),
+        "smoking": smoking_table[smoking_idx],
+        "wholegrains": ppu["wholegrains"] * (as_float(wholegrains, dtype) / per["wholegrains"]),
+        "coffee": ppu["coffee"] * (as_float(coffee, dtype) / per["coffee"]),
+        "redmeat": ppu["redmeat"] * (as_float(redmeat, dtype) / per["redmeat"]),
+        "diabetes_parents": parent_points,
+        "diabetes_sibling": bin_points["diabetes_sibling"] * as_flag(diabetes_sibling, dtype),
+        "hba1c": as_float(hba1c, dtype),
+    }
+    terms = tuple(points)
+    weights = {name: op_mult for name in terms}
+    weights["hba1c"] = tables["hba1c_mult"]
+
+    clinical_points, matrix = weighted_sum(tables["intercept"], weights, points, terms, contributions, dtype)
+    centered = (clinical_points.astype(np.float64) - tables["mean_points"]) / tables["scale"]
+    p_clinical = 1.0 - (tables["baseline_survival"] ** np.exp(centered))
+    risk = (p_clinical * 100.0).astype(dtype, copy=False)
+    if contributions:
+        return {"risk_5y": risk, "contributions": matrix, "terms": terms}
+    return risk
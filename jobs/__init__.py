@@ -0,0 +1,3 @@
+from .jobs_core import job_status, load_manifest, reduce_job, run_worker, write_manifest
+
+__all__ = ["job_status", "load_manifest", "reduce_job", "run_worker", "write_manifest"]
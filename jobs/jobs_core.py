@@ -0,0 +1,271 @@
+import json
+import os
+import socket
+import time
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from ..aggregate.aggregate_core import RiskAggregator
+from ..backends.backends_core import score as backend_score
+from ..common.io import bundle_sha256, load_bundle_file
+from ..common.models import get_model
+
+_FORMAT = "risk_job_manifest/1"
+_LEASE_SECONDS = 6 * 3600
+
+ModelEntry = Union[str, Dict]
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """Write via a private temp file + fsync + rename, so readers never see partial files."""
+    tmp = f"{path}.{socket.gethostname()}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _load_model_bundle(entry: Dict, base_dir: str) -> Dict:
+    """A manifest model's bundle: a file path (relative to the manifest) or a packaged filename."""
+    source = entry.get("bundle")
+    if source and os.path.isfile(os.path.join(base_dir, source)):
+        return load_bundle_file(os.path.join(base_dir, source))
+    loader = get_model(entry["name"])["load_bundle"]
+    return loader(source) if source else loader()
+
+
+def write_manifest(
+    path: str,
+    shards: Sequence[str],
+    models: Sequence[ModelEntry],
+    group_by: Sequence[str] = (),
+    work_dir: str = "work",
+    job_id: Optional[str] = None,
+) -> Dict:
+    """
+    Create a job manifest.
+
+    shards:   input shard files (.npz with one array per scorer argument, e.g. "age",
+              "sbp", "region"), relative to the manifest or absolute
+    models:   model names ("score2") or dicts {"name", "bundle", "options", "summaries"};
+              "bundle" is a packaged filename or a bundle file path, "options" extra
+              scorer arguments (and "backend", see `backends.score`), "summaries"
+              RiskAggregator metric specs
+    group_by: shard columns to group the per-shard summaries by (e.g. region, sex)
+    work_dir: shared directory for claims, partial results and summaries
+
+    Each model's bundle is loaded here and pinned by version and content hash.
+    """
+    base_dir = os.path.dirname(os.path.abspath(path))
+    entries = []
+    for m in models:
+        entry = {"name": m} if isinstance(m, str) else dict(m)
+        get_model(entry["name"])
+        bundle = _load_model_bundle(entry, base_dir)
+        entry["version"] = bundle.get("version")
+        entry["sha256"] = bundle_sha256(bundle)
+        entries.append(entry)
+
+    manifest = {
+        "format": _FORMAT,
+        "job_id": job_id or os.path.splitext(os.path.basename(path))[0],
+        "shards": [{"id": f"shard-{i:05d}", "path": p} for i, p in enumerate(shards)],
+        "models": entries,
+        "group_by": list(group_by),
+        "work_dir": work_dir,
+    }
+    _atomic_write(path, json.dumps(manifest, indent=2).encode("utf-8"))
+    return manifest
+
+
+def load_manifest(path: str) -> Dict:
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != _FORMAT:
+        raise ValueError(f"Unsupported manifest format {manifest.get('format')!r}.")
+    return manifest
+
+
+def _layout(manifest_path: str, manifest: Dict) -> Dict[str, str]:
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    root = os.path.join(base_dir, manifest["work_dir"])
+    dirs = {name: os.path.join(root, name) for name in ("claims", "results", "summaries", "done")}
+    for d in dirs.values():
+        os.makedirs(d, exist_ok=True)
+    dirs["base"] = base_dir
+    return dirs
+
+
+def _try_claim(path: str, node_id: str, lease_seconds: float) -> bool:
+    """
+    Claim a shard by creating its claim file exclusively. A claim older than the lease
+    (a node that died) may be taken over; if two nodes race for a stale claim both
+    score the shard, which is harmless because outputs are deterministic and
+    committed by atomic rename.
+    """
+    record = json.dumps({"node": node_id, "pid": os.getpid(), "time": time.time()}).encode("utf-8")
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        try:
+            age = time.time() - os.path.getmtime(path)
+        except FileNotFoundError:
+            return False
+        if age < lease_seconds:
+            return False
+        _atomic_write(path, record)
+        return True
+    with os.fdopen(fd, "wb") as f:
+        f.write(record)
+    return True
+
+
+def _score_shard(
+    shard: Dict, manifest: Dict, bundles: Dict[str, Dict], tables: Dict[str, Dict], dirs: Dict[str, str], node_id: str,
+) -> Dict:
+    with np.load(os.path.join(dirs["base"], shard["path"]), allow_pickle=False) as data:
+        inputs = {k: data[k] for k in data.files}
+    n_rows = len(next(iter(inputs.values()))) if inputs else 0
+    groups = {g: inputs[g] for g in manifest["group_by"]}
+
+    columns, summaries = {}, {}
+    for entry in manifest["models"]:
+        name = entry["name"]
+        outputs = backend_score(name, inputs, bundles[name], tables=tables[name], **entry.get("options", {}))
+        for out_name, arr in outputs.items():
+            columns[f"{name}.{out_name}"] = arr
+
+        metrics = entry.get("summaries") or get_model(name)["summaries"]
+        agg = RiskAggregator(metrics, manifest["group_by"])
+        agg.update({m: outputs[m] for m in metrics}, groups)
+        summary_path = os.path.join(dirs["summaries"], f"{shard['id']}.{name}.bin")
+        _atomic_write(summary_path, agg.to_bytes())
+        summaries[name] = os.path.basename(summary_path)
+
+    result_path = os.path.join(dirs["results"], f"{shard['id']}.npz")
+    tmp = f"{result_path}.{socket.gethostname()}.{os.getpid()}.tmp.npz"
+    np.savez(tmp, **columns)
+    with open(tmp, "rb") as f:
+        os.fsync(f.fileno())
+    os.replace(tmp, result_path)
+
+    record = {
+        "shard": shard["id"],
+        "node": node_id,
+        "rows": n_rows,
+        "bundles": {e["name"]: bundle_sha256(bundles[e["name"]]) for e in manifest["models"]},
+        "result": os.path.basename(result_path),
+        "summaries": summaries,
+        "finished": time.time(),
+    }
+    # The done record is written last: it is the commit point for the shard.
+    _atomic_write(os.path.join(dirs["done"], f"{shard['id']}.json"), json.dumps(record).encode("utf-8"))
+    return record
+
+
+def run_worker(
+    manifest_path: str,
+    node_id: Optional[str] = None,
+    lease_seconds: float = _LEASE_SECONDS,
+    max_shards: Optional[int] = None,
+) -> List[str]:
+    """
+    Claim and score shards until none are left (or `max_shards` were scored).
+
+    Any number of nodes can run this against the same manifest on a shared
+    filesystem; coordination is by exclusive claim files, so no external service is
+    needed. Before scoring, each node checks that its bundles hash to the values
+    pinned in the manifest. Returns the ids of the shards this call scored.
+    """
+    manifest = load_manifest(manifest_path)
+    dirs = _layout(manifest_path, manifest)
+    node_id = node_id or f"{socket.gethostname()}:{os.getpid()}"
+
+    bundles, tables = {}, {}
+    for entry in manifest["models"]:
+        bundle = _load_model_bundle(entry, dirs["base"])
+        digest = bundle_sha256(bundle)
+        if digest != entry["sha256"]:
+            raise ValueError(
+                f"Bundle for {entry['name']!r} on node {node_id} has sha256 {digest}, "
+                f"manifest pins {entry['sha256']}."
+            )
+        bundles[entry["name"]] = bundle
+        tables[entry["name"]] = get_model(entry["name"])["prepare"](bundle)
+
+    scored: List[str] = []
+    for shard in manifest["shards"]:
+        if max_shards is not None and len(scored) >= max_shards:
+            break
+        if os.path.exists(os.path.join(dirs["done"], f"{shard['id']}.json")):
+            continue
+        if not _try_claim(os.path.join(dirs["claims"], f"{shard['id']}.claim"), node_id, lease_seconds):
+            continue
+        _score_shard(shard, manifest, bundles, tables, dirs, node_id)
+        scored.append(shard["id"])
+    return scored
+
+
+def job_status(manifest_path: str) -> Dict[str, List[str]]:
+    """Shard ids by state: 'done', 'claimed' (in progress or stale) and 'pending'."""
+    manifest = load_manifest(manifest_path)
+    dirs = _layout(manifest_path, manifest)
+    status = {"done": [], "claimed": [], "pending": []}
+    for shard in manifest["shards"]:
+        if os.path.exists(os.path.join(dirs["done"], f"{shard['id']}.json")):
+            status["done"].append(shard["id"])
+        elif os.path.exists(os.path.join(dirs["claims"], f"{shard['id']}.claim")):
+            status["claimed"].append(shard["id"])
+        else:
+            status["pending"].append(shard["id"])
+    return status
+
+
+def reduce_job(manifest_path: str) -> Dict[str, object]:
+    """
+    Combine the shard partials of a finished job.
+
+    Verifies that every shard is done and was scored with exactly the bundle hashes
+    pinned in the manifest, then merges the per-shard summaries.
+
+    Returns:
+      {
+        'rows': total rows scored,
+        'results': result .npz paths in shard order (columns "<model>.<output>"),
+        'summaries': {model: merged RiskAggregator}
+      }
+    """
+    manifest = load_manifest(manifest_path)
+    dirs = _layout(manifest_path, manifest)
+    pinned = {e["name"]: e["sha256"] for e in manifest["models"]}
+
+    records, missing, mismatched = [], [], []
+    for shard in manifest["shards"]:
+        path = os.path.join(dirs["done"], f"{shard['id']}.json")
+        if not os.path.exists(path):
+            missing.append(shard["id"])
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            record = json.load(f)
+        if record["bundles"] != pinned:
+            mismatched.append(shard["id"])
+        records.append(record)
+    if missing:
+        raise ValueError(f"{len(missing)} shard(s) not scored yet: {missing[:10]}")
+    if mismatched:
+        raise ValueError(f"Shard(s) scored with bundles other than the manifest's: {mismatched[:10]}")
+
+    summaries: Dict[str, RiskAggregator] = {}
+    for record in records:
+        for name, filename in record["summaries"].items():
+            with open(os.path.join(dirs["summaries"], filename), "rb") as f:
+                part = RiskAggregator.from_bytes(f.read())
+            summaries[name] = summaries[name].merge(part) if name in summaries else part
+
+    return {
+        "rows": sum(r["rows"] for r in records),
+        "results": [os.path.join(dirs["results"], r["result"]) for r in records],
+        "summaries": summaries,
+    }
@@ -0,0 +1,3 @@
+from .panel_core import score_panel
+
+__all__ = ["score_panel"]
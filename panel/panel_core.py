@@ -0,0 +1,131 @@
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+
+from ..common.models import get_model, score_model
+
+_DAYS_PER_YEAR = 365.25
+
+
+def _segments(patient_id: np.ndarray):
+    """(segment starts, counts, segment index per row) for rows grouped by patient."""
+    n = patient_id.shape[0]
+    new = np.ones(n, dtype=bool)
+    new[1:] = patient_id[1:] != patient_id[:-1]
+    starts = np.flatnonzero(new)
+    counts = np.diff(np.append(starts, n))
+    return starts, counts, np.cumsum(new) - 1
+
+
+def _visit_years(visit_date, starts: np.ndarray, seg: np.ndarray) -> np.ndarray:
+    """Visit times in years since each patient's first visit (dates as datetime64, or numbers in years)."""
+    t = np.asarray(visit_date)
+    if t.dtype.kind == "M":
+        days = (t - t[starts][seg]) / np.timedelta64(1, "D")
+        return days / _DAYS_PER_YEAR
+    t = t.astype(float)
+    return t - t[starts][seg]
+
+
+def score_panel(
+    name: str,
+    patient_id,
+    visit_date,
+    inputs: Mapping[str, object],
+    bundle: Dict,
+    threshold: Optional[float] = None,
+    output: Optional[str] = None,
+    **options,
+) -> Dict[str, np.ndarray]:
+    """
+    Risk trajectories from long-format visit data (one row per patient visit).
+
+    patient_id: per-row patient key; rows must be sorted by patient, then visit
+    visit_date: per-row datetime64 dates, or numbers in years (e.g. age at visit)
+    inputs:     per-row scorer arguments for model `name` (time-varying SBP, eGFR,
+                GGT, ... and repeated baseline covariates)
+    threshold:  action threshold on `output` (e.g. 10 for 10% SCORE2 risk)
+    output:     the model output to summarize (default the first, e.g. 'risk_10y';
+                for CLivD e.g. 'hazard_ratio')
+
+    All visits are scored in one batch call; per-patient summaries use segmented
+    reductions (np.add/maximum/minimum.reduceat) over the patient blocks, with no
+    Python loop over patients. Visits with a missing (NaN) result are left out of the
+    summaries.
+
+    Returns:
+      {
+        'patient_id':     (P,) patients in input order
+        'start':          (P,) first row of each patient
+        'n_visits':       (P,) visits per patient
+        'risk':           (N,) per-visit `output`
+        'first_risk', 'last_risk': (P,) at the first and last visit
+        'max_risk':       (P,) maximum over visits (NaN if none scored)
+        'max_visit':      (P,) visit index (0-based within the patient) of the maximum
+        'slope_per_year': (P,) least-squares slope of `output` on time in years
+                          (NaN with fewer than two scored visits at distinct times)
+        'first_crossing_visit': (P,) first visit index with `output` >= threshold,
+                          -1 if never (only with `threshold`)
+        'first_crossing_years': (P,) years from the first visit to that visit
+                          (NaN if never; only with `threshold`)
+      }
+    """
+    spec = get_model(name)
+    output = output or spec["outputs"][0]
+    if output not in spec["outputs"]:
+        raise KeyError(f"Model {name!r} has no output {output!r}. Outputs: {spec['outputs']}")
+
+    pid = np.asarray(patient_id)
+    n = pid.shape[0]
+    if n == 0:
+        raise ValueError("No visits.")
+    starts, counts, seg = _segments(pid)
+    if len(np.unique(pid[starts])) != len(starts):
+        raise ValueError("Rows must be sorted by patient: a patient's visits are not contiguous.")
+    t = _visit_years(visit_date, starts, seg)
+    if np.any(np.diff(t)[seg[1:] == seg[:-1]] < 0):
+        raise ValueError("Visits must be sorted by date within each patient.")
+
+    y = np.asarray(score_model(name, inputs, bundle, **options)[output], dtype=float).reshape(-1)
+    if y.shape[0] != n:
+        raise ValueError(f"Scored {y.shape[0]} rows for {n} visits; inputs must have one row per visit.")
+
+    rows = np.arange(n)
+    valid = np.isfinite(y)
+    y0 = np.where(valid, y, 0.0)
+    t0 = np.where(valid, t, 0.0)
+
+    # Least-squares slope on per-patient centered time and risk
+    k = np.add.reduceat(valid.astype(float), starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t_mean = np.add.reduceat(t0, starts) / k
+        y_mean = np.add.reduceat(y0, starts) / k
+        dt = np.where(valid, t - t_mean[seg], 0.0)
+        dy = np.where(valid, y - y_mean[seg], 0.0)
+        sxx = np.add.reduceat(dt * dt, starts)
+        slope = np.where((k >= 2) & (sxx > 0), np.add.reduceat(dt * dy, starts) / sxx, np.nan)
+
+    max_risk = np.maximum.reduceat(np.where(valid, y, -np.inf), starts)
+    at_max = valid & (y == max_risk[seg])
+    max_row = np.minimum.reduceat(np.where(at_max, rows, n), starts)
+    has_any = k > 0
+
+    result = {
+        "patient_id": pid[starts],
+        "start": starts,
+        "n_visits": counts,
+        "risk": y,
+        "first_risk": y[starts],
+        "last_risk": y[starts + counts - 1],
+        "max_risk": np.where(has_any, max_risk, np.nan),
+        "max_visit": np.where(has_any, max_row - starts, -1),
+        "slope_per_year": slope,
+    }
+
+    if threshold is not None:
+        crossed = valid & (y >= float(threshold))
+        first_row = np.minimum.reduceat(np.where(crossed, rows, n), starts)
+        ever = first_row < n
+        result["first_crossing_visit"] = np.where(ever, first_row - starts, -1)
+        result["first_crossing_years"] = np.where(ever, t[np.minimum(first_row, n - 1)], np.nan)
+    return result
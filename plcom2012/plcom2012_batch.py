@@ -0,0 +1,164 @@
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+
+from ..common.batch import as_flag, as_float, float_dtype, weighted_sum
+
+RACES = (
+    "white",
+    "black",
+    "hispanic",
+    "asian",
+    "american_indian_alaska_native",
+    "native_hawaiian_pacific_islander",
+)
+_RACE_TERMS = ("race_black", "race_hispanic", "race_asian", "race_ai_an", "race_nh_pi")
+
+
+def _plco_constants(bundle: Dict):
+    """Centering constants (age, education, BMI, duration, quit time) and intensity-term constant."""
+    helpers = bundle.get("shared_transform_helpers", {})
+    centers = helpers.get("centering", {})
+    intensity_meta = helpers.get("smoking_intensity_transform", {})
+    center_const = float(intensity_meta.get("steps", [None, None, None])[-1].split()[-1]) \
+        if intensity_meta.get("steps") else 0.4021541613
+    return (
+        float(centers.get("age_years_center", 62.0)),
+        float(centers.get("education_level_center", 4.0)),
+        float(centers.get("bmi_center", 27.0)),
+        float(centers.get("smoking_duration_years_center", 27.0)),
+        float(centers.get("quit_time_years_center", 10.0)),
+        center_const,
+    )
+
+
+def batch_tables(bundle: Dict) -> Dict[str, object]:
+    """Bundle lookups for `plcom2012_risk_6y_batch(tables=...)`: centering constants and LP terms."""
+    lp_def = bundle["model"]["linear_predictor"]
+    return {
+        "constants": _plco_constants(bundle),
+        "terms": tuple(t["name"] for t in lp_def["terms"]),
+        "coefs": {t["name"]: float(t["coefficient"]) for t in lp_def["terms"]},
+        "intercept": float(lp_def["intercept"]),
+    }
+
+
+def _build_plco_context_batch(
+    age_years,
+    race,
+    education_level,
+    bmi,
+    copd,
+    personal_history_cancer,
+    family_history_lung_cancer,
+    smoking_status,
+    smoking_intensity_cigs_per_day,
+    smoking_duration_years,
+    quit_time_years,
+    constants: tuple,
+    dtype=np.float64,
+) -> Dict[str, np.ndarray]:
+    """Array version of `plcom2012_core._build_plco_context` (`dtype` arrays; `constants` from `_plco_constants`)."""
+    age_c, edu_c, bmi_c, dur_c, quit_c, center_const = constants
+
+    current = (np.asarray(smoking_status) == "current").astype(dtype)
+
+    # Per model convention: current smokers have quit time = 0 (missing quit time too)
+    qt = as_float(quit_time_years, dtype)
+    qt = np.where((current > 0) | ~np.isfinite(qt), 0.0, qt)
+
+    # guard against zero cigs/day for an ever-smoker
+    x = np.maximum(as_float(smoking_intensity_cigs_per_day, dtype) / 10.0, 1e-6)
+
+    race = np.asarray(race)
+    ctx: Dict[str, np.ndarray] = {
+        "age_centered": as_float(age_years, dtype) - age_c,
+        "education_centered": as_float(education_level, dtype) - edu_c,
+        "bmi_centered": as_float(bmi, dtype) - bmi_c,
+        "copd_yes": as_flag(copd, dtype),
+        "personal_cancer_yes": as_flag(personal_history_cancer, dtype),
+        "family_lung_cancer_yes": as_flag(family_history_lung_cancer, dtype),
+        "smoking_current": current,
+        "smoking_intensity_term": (x ** -1.0) - center_const,
+        "smoking_duration_centered": as_float(smoking_duration_years, dtype) - dur_c,
+        "quit_time_centered": qt - quit_c,
+    }
+    # race one-hot (white is reference)
+    for code, term in zip(RACES[1:], _RACE_TERMS):
+        ctx[term] = (race == code).astype(dtype)
+    return ctx
+
+
+def plcom2012_risk_6y_batch(
+    age_years,
+    race,
+    education_level,
+    bmi,
+    copd,
+    personal_history_cancer,
+    family_history_lung_cancer,
+    smoking_status,
+    smoking_intensity_cigs_per_day,
+    smoking_duration_years,
+    quit_time_years,
+    bundle: Dict = None,
+    contributions: bool = False,
+    precision: str = "float64",
+    tables: Optional[Mapping] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized `plcom2012_risk_6y`: every argument may be an array (arrays broadcast
+    against each other); missing quit time is None or NaN.
+
+    Returns:
+      {
+        'risk_6y': array,            # probability in percent [0, 100]
+        'prob_6y': array,            # probability in [0, 1]
+        'linear_predictor': array,   # logistic LP
+        'contributions': (n, terms) coefficient * term, summing to LP - intercept  # with `contributions`
+        'terms': term names, in bundle order                                        # with `contributions`
+      }
+
+    precision="float32" keeps inputs, terms and all outputs in float32; the logistic
+    transform is evaluated in float64, so tail probabilities keep their relative
+    precision.
+
+    `tables` is `batch_tables(bundle)`, for callers that score one bundle many times.
+    """
+    dtype = float_dtype(precision)
+    if bundle is None:
+        raise ValueError("'bundle' is required (pass load_plcom2012_bundle()).")
+    if tables is None:
+        tables = batch_tables(bundle)
+
+    ctx = _build_plco_context_batch(
+        age_years=age_years,
+        race=race,
+        education_level=education_level,
+        bmi=bmi,
+        copd=copd,
+        personal_history_cancer=personal_history_cancer,
+        family_history_lung_cancer=family_history_lung_cancer,
+        smoking_status=smoking_status,
+        smoking_intensity_cigs_per_day=smoking_intensity_cigs_per_day,
+        smoking_duration_years=smoking_duration_years,
+        quit_time_years=quit_time_years,
+        constants=tables["constants"],
+        dtype=dtype,
+    )
+
+    # Linear predictor from bundle
+    terms = tables["terms"]
+    lp, matrix = weighted_sum(tables["intercept"], tables["coefs"], ctx, terms, contributions, dtype)
+
+    # Logistic probability
+    prob = np.clip(1.0 / (1.0 + np.exp(-lp.astype(np.float64))), 0.0, 1.0)
+    out = {
+        "risk_6y": (prob * 100.0).astype(dtype, copy=False),
+        "prob_6y": prob.astype(dtype, copy=False),
+        "linear_predictor": lp,
+    }
+    if contributions:
+        out["contributions"] = matrix
+        out["terms"] = terms
+    return out
@@ -0,0 +1,107 @@
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+
+from ..common.batch import as_flag, as_float, category_index, float_dtype, weighted_sum
+
+SEXES = ("male", "female")
+BETAS = (
+    "cage", "smoke", "csbp", "ctchol", "chdl",
+    "cage*smoke", "cage*csbp", "cage*ctchol", "cage*chdl",
+    "diab", "cage*diab",
+)
+# Terms entering the SCORE2 linear predictor (diabetes terms are SCORE2-Diabetes only).
+LP_TERMS = BETAS[:9]
+
+
+def _coefficient_tables(bundle: Dict):
+    """Betas and region params as (region, sex) lookup tables, plus the region order."""
+    regions = list(bundle["by_region"])
+    betas = {name: np.zeros((len(regions), len(SEXES))) for name in BETAS}
+    params = np.zeros((len(regions), len(SEXES), 2))
+    for r, region in enumerate(regions):
+        for s, sex in enumerate(SEXES):
+            entry = bundle["by_region"][region][sex]
+            for name in BETAS:
+                betas[name][r, s] = entry["betas"][name]
+            params[r, s] = entry["region_params"]
+    return regions, betas, params
+
+
+def batch_tables(bundle: Dict) -> Dict[str, object]:
+    """Bundle lookups for `score2_risk_batch(tables=...)`: region order, betas and region params."""
+    regions, betas, params = _coefficient_tables(bundle)
+    return {"regions": tuple(regions), "betas": betas, "params": params}
+
+
+def score2_risk_batch(
+    age,
+    sex,
+    smoker,
+    sbp,
+    tchol,
+    hdl,
+    region,
+    bundle: Dict,
+    contributions: bool = False,
+    precision: str = "float64",
+    tables: Optional[Mapping] = None,
+):
+    """
+    Vectorized `score2_risk`: every argument may be an array (arrays broadcast
+    against each other) and rows may mix sexes and regions. Returns 10-year CVD
+    risk in percent per row.
+
+    With `contributions`, returns {'risk_10y', 'contributions', 'terms'} instead:
+    'contributions' is (n, 9) beta * term for LP_TERMS (BETAS order), summing to
+    the linear predictor.
+
+    precision="float32" keeps inputs, terms, the linear predictor and the result in
+    float32; the survival transform and the log(-log(1 - p)) recalibration near the
+    1e-15 clamps are still evaluated in float64.
+
+    `tables` is `batch_tables(bundle)`, for callers that score one bundle many times.
+    """
+    dtype = float_dtype(precision)
+    age = as_float(age, dtype)
+    if np.any(~((age >= 40) & (age <= 69))):
+        bad = age[~((age >= 40) & (age <= 69))]
+        raise ValueError(f"SCORE2 is only validated for ages 40–69 (got {bad.flat[0]})")
+
+    if tables is None:
+        tables = batch_tables(bundle)
+    regions, betas, params = tables["regions"], tables["betas"], tables["params"]
+    r = category_index(region, regions, "region", lower=True)
+    s = category_index(sex, SEXES, "sex", lower=True)
+
+    # scaling
+    cage   = (age - 60) / 5
+    csbp   = (as_float(sbp, dtype) - 120) / 20
+    ctchol = (as_float(tchol, dtype) - 6) / 1
+    chdl   = (as_float(hdl, dtype) - 1.3) / 0.5
+    smoke  = as_flag(smoker, dtype)
+    terms = {
+        "cage": cage, "smoke": smoke, "csbp": csbp, "ctchol": ctchol, "chdl": chdl,
+        "cage*smoke": cage * smoke, "cage*csbp": cage * csbp,
+        "cage*ctchol": cage * ctchol, "cage*chdl": cage * chdl,
+    }
+
+    # linear predictor (diab = 0 for SCORE2)
+    coefs = {name: betas[name].astype(dtype, copy=False)[r, s] for name in LP_TERMS}
+    LP, matrix = weighted_sum(0.0, coefs, terms, LP_TERMS, contributions, dtype)
+
+    # sex-specific baseline survival
+    s0_10y = np.array([0.9605, 0.9776])[s]
+
+    # base risk and regional recalibration (float64 whatever the storage precision)
+    p_base = 1.0 - (s0_10y ** np.exp(LP.astype(np.float64)))
+    p_base = np.clip(p_base, 1e-15, 1 - 1e-15)  # avoid log(0) issues
+
+    x = np.log(-np.log(1.0 - p_base))
+    x_adj = params[r, s, 0] + params[r, s, 1] * x
+    p_reg = 1.0 - np.exp(-np.exp(x_adj))
+
+    risk = (p_reg * 100.0).astype(dtype, copy=False)
+    if contributions:
+        return {"risk_10y": risk, "contributions": matrix, "terms": LP_TERMS}
+    return risk
@@ -0,0 +1,13 @@
+from .parallel import score_processes, score_threaded, split_rows
+from .serving_core import BundleManager, CompiledModel, compile_model, freeze, thaw
+
+__all__ = [
+    "BundleManager",
+    "CompiledModel",
+    "compile_model",
+    "freeze",
+    "score_processes",
+    "score_threaded",
+    "split_rows",
+    "thaw",
+]
@@ -0,0 +1,59 @@
+"""
+Serial vs thread-pool vs process-pool scoring throughput.
+
+    python -m risk_calculators.serving.benchmark [model] [rows] [workers]
+"""
+import os
+import sys
+import time
+from typing import Dict, Optional
+
+from ..backends.backends_core import sample_inputs
+from ..common.models import get_model
+from .parallel import score_processes, score_threaded
+from .serving_core import compile_model
+
+
+def benchmark_parallel(
+    name: str = "score2",
+    n: int = 1_000_000,
+    workers: Optional[int] = None,
+    repeats: int = 3,
+) -> Dict[str, float]:
+    """
+    Rows/second for serial `model.score`, `score_threaded` and `score_processes` on
+    `n` random rows (best of `repeats`; process-pool timings include pool start-up).
+    """
+    model = compile_model(name, get_model(name)["load_bundle"]())
+    inputs = sample_inputs(name, n)
+    workers = workers or os.cpu_count() or 1
+    runs = {
+        "serial": lambda: model.score(inputs),
+        "threads": lambda: score_threaded(model, inputs, workers),
+        "processes": lambda: score_processes(model, inputs, workers),
+    }
+    results = {}
+    for label, run in runs.items():
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+        results[label] = n / best
+    return results
+
+
+def main(argv=None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    name = argv[0] if argv else "score2"
+    n = int(argv[1]) if len(argv) > 1 else 1_000_000
+    workers = int(argv[2]) if len(argv) > 2 else os.cpu_count() or 1
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"{name}: {n:,} rows, {workers} workers, GIL {'enabled' if gil else 'disabled'}")
+    for label, rate in benchmark_parallel(name, n, workers).items():
+        print(f"  {label:<10} {rate:>14,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional
+
+import numpy as np
+
+from ..backends.backends_core import score as backend_score
+from ..common.io import bundle_sha256, load_bundle_file
+from ..common.models import get_model
+
+
+def _bundle_identity(bundle: Mapping) -> Optional[str]:
+    """Model identity declared by a bundle ('model_id', or SCORE2's 'model')."""
+    if not isinstance(bundle, Mapping):
+        return None
+    identity = bundle.get("model_id", bundle.get("model"))
+    return identity if isinstance(identity, str) else None
+
+
+def freeze(obj):
+    """
+    Deeply immutable copy of a bundle: mappings become read-only MappingProxyType
+    views of private dicts, lists become tuples and NumPy arrays read-only copies.
+    The scorers read a frozen bundle like the loaded JSON, and `bundle_sha256` hashes
+    it the same.
+    """
+    if isinstance(obj, Mapping):
+        return MappingProxyType({k: freeze(v) for k, v in obj.items()})
+    if isinstance(obj, (list, tuple)):
+        return tuple(freeze(v) for v in obj)
+    if isinstance(obj, np.ndarray):
+        arr = obj.copy()
+        arr.setflags(write=False)
+        return arr
+    return obj
+
+
+def thaw(obj):
+    """Plain dict/list copy of a frozen bundle (to edit it, pickle it or write it as JSON)."""
+    if isinstance(obj, Mapping):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [thaw(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return obj.copy()
+    return obj
+
+
+class CompiledModel:
+    """
+    A validated bundle bound to its batch scorer.
+
+    The model is immutable: the bundle is frozen (deep copy, see `freeze`) at
+    compile time and attributes cannot be reassigned, so later changes to the
+    caller's dict or to the file it came from never reach a serving model, and any
+    number of threads can score with one instance. The scorer's coefficient and
+    category tables (`MODELS[name]["prepare"]`) are built once here and stored
+    read-only in `tables`, so `score()` does no per-call bundle parsing. Results are
+    fresh per call and stamped with the model name, bundle version and bundle hash.
+    """
+
+    __slots__ = ("name", "version", "sha256", "identity", "source", "compiled_at", "bundle", "tables")
+
+    def __init__(self, name: str, bundle: Mapping, source: Optional[str] = None):
+        frozen = freeze(bundle)
+        init = object.__setattr__
+        init(self, "name", name)
+        init(self, "bundle", frozen)
+        init(self, "tables", freeze(get_model(name)["prepare"](frozen)))
+        init(self, "version", frozen.get("version"))
+        init(self, "sha256", bundle_sha256(frozen))
+        init(self, "identity", _bundle_identity(frozen))
+        init(self, "source", source)
+        init(self, "compiled_at", time.time())
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"CompiledModel is immutable (cannot set {name!r}).")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"CompiledModel is immutable (cannot delete {name!r}).")
+
+    def __reduce__(self):
+        # frozen mappings do not pickle; rebuild from a plain copy (for process pools)
+        return (_restore_model, (self.name, thaw(self.bundle), self.source, self.compiled_at))
+
+    def score(self, inputs: Mapping[str, object], backend: str = "auto", **options) -> Dict[str, object]:
+        """
+        Score a batch on `backend` (see `backends.score`; "auto" uses Numba for the
+        models where it is faster). Returns the output arrays plus 'model',
+        'bundle_version' and 'bundle_sha256'.
+        """
+        result: Dict[str, object] = dict(
+            backend_score(self.name, inputs, self.bundle, backend=backend, tables=self.tables, **options)
+        )
+        result["model"] = self.name
+        result["bundle_version"] = self.version
+        result["bundle_sha256"] = self.sha256
+        return result
+
+    def __repr__(self) -> str:
+        return f"CompiledModel({self.name!r}, version={self.version!r}, sha256={self.sha256[:12]}...)"
+
+
+def _restore_model(name: str, bundle: Dict, source: Optional[str], compiled_at: float) -> CompiledModel:
+    model = CompiledModel(name, bundle, source)
+    object.__setattr__(model, "compiled_at", compiled_at)
+    return model
+
+
+def compile_model(
+    name: str,
+    bundle: Mapping,
+    source: Optional[str] = None,
+    expected_identity: Optional[str] = None,
+) -> CompiledModel:
+    """
+    Validate a bundle and compile it for serving.
+
+    Checks that the bundle declares the expected model identity (when given) and
+    scores the registry's canary rows (`MODELS[name]["example"]`): a bundle with
+    missing or malformed sections fails here instead of on live traffic, and numeric
+    outputs must be finite. Raises ValueError on failure.
+    """
+    spec = get_model(name)
+    if not isinstance(bundle, Mapping):
+        raise ValueError(f"Bundle for {name!r} is a {type(bundle).__name__}, not a JSON object.")
+    if expected_identity is not None and _bundle_identity(bundle) != expected_identity:
+        raise ValueError(
+            f"Bundle for {name!r} declares model {_bundle_identity(bundle)!r}, expected {expected_identity!r}."
+        )
+    try:
+        model = CompiledModel(name, bundle, source)
+        canary = model.score(spec["example"])
+    except (KeyError, TypeError, ValueError, IndexError, AttributeError) as e:
+        raise ValueError(f"Bundle for {name!r} failed to compile or score the canary rows: {e!r}") from e
+    for out in spec["outputs"]:
+        values = np.asarray(canary[out])
+        if values.dtype.kind == "f" and not np.all(np.isfinite(values)):
+            raise ValueError(f"Bundle for {name!r} gives non-finite {out!r} on canary rows: {values}")
+    return model
+
+
+class BundleManager:
+    """
+    Keeps one active CompiledModel per model and swaps in new bundle versions.
+
+    watch: {model name: bundle file path}; None serves the packaged bundle (not
+           reloaded)
+
+    `check()` (or the background poller from `start()`) stats the watched files;
+    when one changed and its content hash differs, the bundle is loaded, validated
+    and compiled on the polling thread, then published by replacing the whole
+    name -> model mapping in a single reference assignment. Scoring threads only
+    read that reference: no lock is taken on the scoring path, a batch keeps the
+    model it started with until it finishes, and the next `get()` sees the new one.
+    A bundle that fails validation (or cannot be read at all) is reported in
+    `errors` (and to `on_error`) and the previous version keeps serving; the file is
+    retried on every poll until a version passes. Errors outside a single model
+    (e.g. from `on_swap`) are reported under '*' and do not stop the poller.
+    """
+
+    def __init__(
+        self,
+        watch: Mapping[str, Optional[str]],
+        poll_interval: float = 5.0,
+        on_swap: Optional[Callable[[CompiledModel, Optional[CompiledModel]], None]] = None,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ):
+        self.poll_interval = float(poll_interval)
+        self.on_swap = on_swap
+        self.on_error = on_error
+        self.errors: Dict[str, str] = {}
+        self._paths = dict(watch)
+        self._stamps: Dict[str, tuple] = {}
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        active = {}
+        for name, path in self._paths.items():
+            if path is None:
+                active[name] = compile_model(name, get_model(name)["load_bundle"]())
+            else:
+                self._stamps[name] = self._stamp(path)
+                active[name] = compile_model(name, load_bundle_file(path), source=path)
+        self._active: Dict[str, CompiledModel] = active
+
+    @staticmethod
+    def _stamp(path: str) -> tuple:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def get(self, name: str) -> CompiledModel:
+        """The model currently serving `name` (hold on to it for the whole batch)."""
+        return self._active[name]
+
+    def models(self) -> Mapping[str, CompiledModel]:
+        """Consistent, read-only snapshot of all active models."""
+        return MappingProxyType(self._active)
+
+    def score(self, name: str, inputs: Mapping[str, object], **options) -> Dict[str, object]:
+        return self._active[name].score(inputs, **options)
+
+    def check(self) -> List[str]:
+        """Poll the watched files once; returns the names whose model was swapped."""
+        swapped = []
+        with self._write_lock:
+            for name, path in self._paths.items():
+                if path is None:
+                    continue
+                try:
+                    stamp = self._stamp(path)
+                except OSError as e:
+                    self._report(name, e)
+                    continue
+                if stamp == self._stamps.get(name):
+                    continue
+
+                old = self._active[name]
+                try:
+                    bundle = load_bundle_file(path)
+                    if bundle_sha256(bundle) == old.sha256:
+                        self._stamps[name] = stamp
+                        continue
+                    new = compile_model(name, bundle, source=path, expected_identity=old.identity)
+                except Exception as e:  # any malformed bundle: report it, keep the old model
+                    self._report(name, e)
+                    continue
+
+                self._stamps[name] = stamp
+                self._active = {**self._active, name: new}
+                self.errors.pop(name, None)
+                swapped.append(name)
+                if self.on_swap is not None:
+                    self.on_swap(new, old)
+        return swapped
+
+    def _report(self, name: str, error: Exception) -> None:
+        self.errors[name] = str(error)
+        if self.on_error is not None:
+            self.on_error(name, error)
+
+    def start(self) -> "BundleManager":
+        """Start polling every `poll_interval` seconds on a daemon thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="bundle-manager", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.check()
+            except Exception as e:  # e.g. a failing on_swap callback; keep polling
+                self._report("*", e)
+
+    def __enter__(self) -> "BundleManager":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
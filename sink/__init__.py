@@ -0,0 +1,3 @@
+from .sink_core import ResultSink, read_checkpoint, read_results, score_to_sink
+
+__all__ = ["ResultSink", "read_checkpoint", "read_results", "score_to_sink"]
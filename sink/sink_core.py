@@ -0,0 +1,264 @@
+import json
+import os
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+
+from ..common.io import bundle_sha256
+from ..common.models import score_model
+
+_FORMAT = "risk_result_sink/1"
+_CHECKPOINT = "checkpoint.json"
+BLOCK_ROWS = 65536
+# run identity keys score_to_sink records in the checkpoint meta
+_RUN_KEYS = ("model", "rows", "bundle_sha256", "options")
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """Write via temp file + fsync + rename, so a reader sees the old or the new file."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _column_dtype(name: str, dtype) -> np.dtype:
+    dtype = np.dtype(dtype)
+    if dtype.kind not in "biuf":
+        raise ValueError(f"Column {name!r} has dtype {dtype}; only fixed-width numeric and bool columns are stored.")
+    return dtype
+
+
+def _plain(value):
+    """JSON-able form of a scorer option (arrays and NumPy scalars as lists / numbers)."""
+    return value.tolist() if isinstance(value, (np.ndarray, np.generic)) else value
+
+
+def read_checkpoint(path: str) -> Optional[Dict]:
+    """The last committed checkpoint of a sink directory (None if nothing was committed)."""
+    try:
+        with open(os.path.join(path, _CHECKPOINT), "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except FileNotFoundError:
+        return None
+    if checkpoint.get("format") != _FORMAT:
+        raise ValueError(f"Unsupported result sink format {checkpoint.get('format')!r}.")
+    return checkpoint
+
+
+class ResultSink:
+    """
+    Append-only columnar result file with checkpoints, for long scoring runs.
+
+    path:       directory; one raw little-endian file per column (`<name>.bin`) plus
+                `checkpoint.json`
+    columns:    {name: dtype} (float64 risks, int8 group codes, bool flags, ...);
+                None takes the columns and dtypes of the first `append`
+    block_rows: rows buffered in memory per column before a block is written
+    meta:       JSON-able identity of the run (input file, bundle hash, options);
+                resuming with different meta raises ValueError
+
+    Rows are copied into preallocated block buffers; each full block is written
+    to every column file with one write per column, the files are fsynced, and only
+    then is the checkpoint (committed row count) replaced atomically. Opening an
+    existing sink resumes it: column files are truncated back to the checkpoint,
+    dropping any partly written block, and `rows` tells the caller where to restart.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        columns: Optional[Mapping[str, object]] = None,
+        block_rows: int = BLOCK_ROWS,
+        meta: Optional[Mapping] = None,
+    ):
+        self.path = path
+        self.block_rows = int(block_rows)
+        self.meta = json.loads(json.dumps(dict(meta or {})))
+        self.rows = 0
+        self.blocks = 0
+        self.complete = False
+        self.columns: Dict[str, np.dtype] = {}
+        self._buffers: Dict[str, np.ndarray] = {}
+        self._files: Dict[str, object] = {}
+        self._fill = 0
+        self._closed = False
+        os.makedirs(path, exist_ok=True)
+
+        checkpoint = read_checkpoint(path)
+        if checkpoint is not None:
+            if checkpoint["meta"] != self.meta:
+                raise ValueError(f"Sink {path!r} belongs to another run: meta {checkpoint['meta']} != {self.meta}")
+            stored = {c["name"]: np.dtype(c["dtype"]) for c in checkpoint["columns"]}
+            if columns is not None and {k: np.dtype(v) for k, v in columns.items()} != stored:
+                raise ValueError(f"Sink {path!r} has columns {stored}, not {dict(columns)}.")
+            self.rows = int(checkpoint["rows"])
+            self.blocks = int(checkpoint["blocks"])
+            self.complete = bool(checkpoint["complete"])
+            self._open(stored)
+        elif columns is not None:
+            self._open({k: _column_dtype(k, v) for k, v in columns.items()})
+
+    def _open(self, columns: Mapping[str, np.dtype]) -> None:
+        self.columns = {k: np.dtype(v).newbyteorder("<") for k, v in columns.items()}
+        for name, dtype in self.columns.items():
+            f = open(os.path.join(self.path, f"{name}.bin"), "a+b")
+            # drop anything written after the last checkpoint
+            f.truncate(self.rows * dtype.itemsize)
+            f.seek(0, os.SEEK_END)
+            self._files[name] = f
+            self._buffers[name] = np.empty(self.block_rows, dtype=dtype)
+        if self.rows == 0:
+            self._commit()
+
+    def append(self, outputs: Mapping[str, object]) -> None:
+        """Append rows: {column: 1-D array}, every column of the sink, equal lengths."""
+        if self._closed:
+            raise ValueError(f"Sink {self.path!r} is closed.")
+        if self.complete:
+            raise ValueError(f"Sink {self.path!r} is closed as complete.")
+        if not self.columns:
+            self._open({k: _column_dtype(k, np.asarray(outputs[k]).dtype) for k in outputs})
+        missing = set(self.columns) - set(outputs)
+        if missing:
+            raise KeyError(f"Missing result column(s) {sorted(missing)}.")
+        arrays = {k: np.asarray(outputs[k]).reshape(-1) for k in self.columns}
+        lengths = {a.shape[0] for a in arrays.values()}
+        if len(lengths) != 1:
+            raise ValueError(f"Result columns have different lengths: {sorted(lengths)}")
+        n = lengths.pop()
+
+        start = 0
+        while start < n:
+            take = min(self.block_rows - self._fill, n - start)
+            for name, arr in arrays.items():
+                self._buffers[name][self._fill:self._fill + take] = arr[start:start + take]
+            self._fill += take
+            start += take
+            if self._fill == self.block_rows:
+                self._write_block()
+
+    def _write_block(self) -> None:
+        if self._fill == 0:
+            return
+        for name, f in self._files.items():
+            f.write(memoryview(self._buffers[name][:self._fill]))
+        for f in self._files.values():
+            f.flush()
+            os.fsync(f.fileno())
+        self.rows += self._fill
+        self.blocks += 1
+        self._fill = 0
+        self._commit()
+
+    def _commit(self) -> None:
+        checkpoint = {
+            "format": _FORMAT,
+            "columns": [{"name": k, "dtype": v.str} for k, v in self.columns.items()],
+            "rows": self.rows,
+            "blocks": self.blocks,
+            "complete": self.complete,
+            "meta": self.meta,
+        }
+        _atomic_write(os.path.join(self.path, _CHECKPOINT), json.dumps(checkpoint, indent=2).encode("utf-8"))
+
+    def flush(self) -> None:
+        """Write and checkpoint the buffered rows now (a short block)."""
+        if self._closed:
+            raise ValueError(f"Sink {self.path!r} is closed.")
+        self._write_block()
+
+    def close(self, complete: bool = True) -> None:
+        """
+        Flush, checkpoint (marking the run complete unless `complete=False`) and close
+        the files. Closing twice is a no-op; a closed sink rejects `append` and `flush`
+        (reopen the directory to resume).
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._write_block()
+        if complete and not self.complete and self.columns:
+            self.complete = True
+            self._commit()
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+    def __enter__(self) -> "ResultSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # on error keep what is durable, but do not mark the run complete
+        self.close(complete=exc_type is None)
+
+
+def read_results(path: str, mmap: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Committed result columns of a sink directory, {name: array of checkpoint rows}.
+    With `mmap` the columns are read-only memory maps (no load into RAM).
+    """
+    checkpoint = read_checkpoint(path)
+    if checkpoint is None:
+        return {}
+    rows = int(checkpoint["rows"])
+    out = {}
+    for col in checkpoint["columns"]:
+        dtype = np.dtype(col["dtype"])
+        file = os.path.join(path, f"{col['name']}.bin")
+        if mmap and rows > 0:
+            out[col["name"]] = np.memmap(file, dtype=dtype, mode="r", shape=(rows,))
+        else:
+            out[col["name"]] = np.fromfile(file, dtype=dtype, count=rows)
+    return out
+
+
+def score_to_sink(
+    name: str,
+    inputs: Mapping[str, object],
+    bundle: Dict,
+    path: str,
+    chunk_rows: int = BLOCK_ROWS,
+    meta: Optional[Mapping] = None,
+    **options,
+) -> Dict[str, object]:
+    """
+    Score model `name` over row columns `inputs` (arrays or memory maps of equal
+    length; scalars broadcast) into a ResultSink at `path`, one chunk at a time.
+
+    If the sink already holds a checkpoint from the same run (`meta`), scoring
+    restarts at the first uncommitted row. The run identity stored with the
+    checkpoint is `meta` plus the model, row count, bundle hash (`bundle_sha256`) and
+    the scorer options, so a resume with another bundle or options raises ValueError.
+    `meta` may not set those keys itself ('model', 'rows', 'bundle_sha256',
+    'options'); passing one raises ValueError. Columns are the model's outputs ("risk_10y", "risk_group_15y", ...).
+
+    Returns {'rows': total rows committed, 'scored': rows scored by this call,
+    'resumed_at': first row scored by this call}.
+    """
+    lengths = {np.shape(v)[0] for v in inputs.values() if np.ndim(v) > 0}
+    if len(lengths) > 1:
+        raise ValueError(f"Input columns have different lengths: {sorted(lengths)}")
+    n = lengths.pop() if lengths else 1
+
+    reserved = sorted(set(meta or {}) & set(_RUN_KEYS))
+    if reserved:
+        raise ValueError(f"meta may not set the run identity keys {reserved}; they are recorded by score_to_sink.")
+    run_meta = {
+        **(meta or {}),
+        "model": name,
+        "rows": n,
+        "bundle_sha256": bundle_sha256(bundle),
+        "options": {k: _plain(options[k]) for k in sorted(options)},
+    }
+    sink = ResultSink(path, block_rows=chunk_rows, meta=run_meta)
+    start = sink.rows
+    with sink:
+        for lo in range(start, n, chunk_rows):
+            hi = min(lo + chunk_rows, n)
+            chunk = {k: (v[lo:hi] if np.ndim(v) > 0 else v) for k, v in inputs.items()}
+            outputs = score_model(name, chunk, bundle, **options)
+            sink.append({k: v for k, v in outputs.items() if k not in ("contributions", "terms")})
+    return {"rows": sink.rows, "scored": sink.rows - start, "resumed_at": start}
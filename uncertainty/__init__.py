@@ -0,0 +1,3 @@
+from .uncertainty_core import monte_carlo_risk
+
+__all__ = ["monte_carlo_risk"]
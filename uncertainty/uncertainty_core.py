@@ -0,0 +1,125 @@
+from typing import Callable, Dict, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+# Target number of (patient, draw) cells scored per block; bounds peak memory.
+_BLOCK_CELLS = 2_000_000
+
+Category = Union[None, str, float, Sequence[float]]
+
+
+def _select(result, output: Optional[str]) -> np.ndarray:
+    if isinstance(result, dict):
+        if output is None:
+            raise ValueError(f"'output' is required for scorers returning {sorted(result)}.")
+        return np.asarray(result[output], dtype=float)
+    return np.asarray(result, dtype=float)
+
+
+def _categorize(result, values: np.ndarray, category: Category) -> Optional[np.ndarray]:
+    """Category codes: a result key (e.g. 'risk_group_15y'), one threshold or cut points."""
+    if category is None:
+        return None
+    if isinstance(category, str):
+        return np.asarray(result[category]).astype(np.int64)
+    cuts = np.atleast_1d(np.asarray(category, dtype=float))
+    return np.searchsorted(cuts, values, side="right")
+
+
+def _perturb(values: np.ndarray, spec: Mapping[str, float], z: np.ndarray) -> np.ndarray:
+    """Apply an error model {'sd': ...} (additive) or {'cv': ...} (multiplicative)."""
+    if "sd" in spec:
+        drawn = values[:, None] + float(spec["sd"]) * z
+    elif "cv" in spec:
+        drawn = values[:, None] * (1.0 + float(spec["cv"]) * z)
+    else:
+        raise ValueError(f"Error model needs 'sd' or 'cv' (got {dict(spec)}).")
+    if "min" in spec or "max" in spec:
+        drawn = np.clip(drawn, spec.get("min", -np.inf), spec.get("max", np.inf))
+    return drawn
+
+
+def monte_carlo_risk(
+    scorer: Callable,
+    inputs: Mapping[str, object],
+    errors: Mapping[str, Mapping[str, float]],
+    bundle: Dict,
+    n_draws: int = 1000,
+    output: Optional[str] = None,
+    category: Category = None,
+    quantiles: Sequence[float] = (0.05, 0.5, 0.95),
+    seed: Optional[int] = None,
+    **options,
+) -> Dict[str, np.ndarray]:
+    """
+    Propagate input measurement error through a batch scorer by Monte Carlo.
+
+    scorer:   a vectorized calculator, e.g. score2_risk_batch or clivd_modellab_score_batch
+    inputs:   keyword arguments for the scorer; per-patient arrays (length n) or scalars
+    errors:   error model per perturbed input, e.g.
+              {"sbp": {"sd": 8.0}, "hba1c": {"cv": 0.03}, "ggt": {"cv": 0.1, "min": 0}}
+              ('sd' additive, 'cv' multiplicative; optional 'min'/'max' clip)
+    output:   result key to summarize for dict-returning scorers (e.g. "linear_predictor")
+    category: what defines a risk category for flip probabilities:
+              a result key holding codes ("risk_group_15y", "above_threshold"),
+              a single threshold (e.g. 7.5 for a SCORE2 cut-off) or a list of cut points
+    options:  further fixed scorer arguments (e.g. model="apoe", threshold=2.5)
+
+    Each block of patients is perturbed as one (patients x draws) array per input and
+    scored in a single scorer call; unperturbed inputs are broadcast, not copied.
+
+    Returns:
+      {
+        'nominal': (n,) output at the measured inputs,
+        'quantiles': (n, len(quantiles)) output quantiles across draws,
+        'category': (n,) nominal category code            # with `category`
+        'flip_probability': (n,) share of draws whose category differs  # with `category`
+      }
+    """
+    unknown = set(errors) - set(inputs)
+    if unknown:
+        raise ValueError(f"Error models given for unknown inputs: {sorted(unknown)}")
+
+    arrays = {k: np.asarray(v) for k, v in inputs.items()}
+    n = max((a.shape[0] for a in arrays.values() if a.ndim > 0), default=1)
+    arrays = {k: (a if a.ndim > 0 else np.broadcast_to(a, (n,))) for k, a in arrays.items()}
+    for name in errors:
+        arrays[name] = arrays[name].astype(float)
+
+    q = np.asarray(quantiles, dtype=float)
+    rng = np.random.default_rng(seed)
+    block = max(1, _BLOCK_CELLS // max(int(n_draws), 1))
+
+    nominal = np.empty(n)
+    qs = np.empty((n, q.size))
+    codes = np.empty(n, dtype=np.int64) if category is not None else None
+    flips = np.empty(n) if category is not None else None
+
+    for start in range(0, n, block):
+        sl = slice(start, min(start + block, n))
+        m = sl.stop - sl.start
+        rows = {k: a[sl] for k, a in arrays.items()}
+
+        base = scorer(**rows, bundle=bundle, **options)
+        base_values = _select(base, output)
+        nominal[sl] = base_values
+
+        drawn = {k: a[:, None] for k, a in rows.items()}
+        for name, spec in errors.items():
+            z = rng.standard_normal((m, int(n_draws)))
+            drawn[name] = _perturb(rows[name], spec, z)
+        result = scorer(**drawn, bundle=bundle, **options)
+        values = np.broadcast_to(_select(result, output), (m, int(n_draws)))
+        qs[sl] = np.quantile(values, q, axis=1).T
+
+        if category is not None:
+            base_codes = _categorize(base, base_values, category)
+            codes[sl] = base_codes
+            drawn_codes = _categorize(result, values, category)
+            flips[sl] = np.mean(drawn_codes != base_codes[:, None], axis=1)
+
+    out = {"nominal": nominal, "quantiles": qs}
+    if category is not None:
+        out["category"] = codes
+        out["flip_probability"] = flips
+    return out